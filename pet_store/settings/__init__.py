@@ -17,6 +17,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "store.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -48,6 +49,8 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    "DEFAULT_PAGINATION_CLASS": "store.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
 SIMPLE_JWT = {
@@ -55,6 +58,28 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# Seconds a cached /store/ response is kept; writes invalidate it sooner.
+STORE_CACHE_TIMEOUT = 300
+
+# Build list responses from .values() rows instead of serializer instances.
+STORE_FAST_READS = True
+
+# Per-request query counts and timings (Server-Timing header and /metrics).
+STORE_REQUEST_METRICS = True
+
+# Fan-out of live bid events to SSE streams; replace with a broker shared by
+# every process when running more than one.
+STORE_EVENT_BROKER = "store.events.LocalBroker"
+
+# Seconds between keepalive comments on an idle event stream.
+STORE_EVENTS_KEEPALIVE = 15
+
 SWAGGER_SETTINGS = {"SECURITY_DEFINITIONS": {"Basic": {"type": "basic"}}}
 
 
@@ -12,5 +12,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Wait for the write lock instead of failing under concurrent bids.
+        "OPTIONS": {"timeout": 20},
+        # A file (not in-memory) test database so threaded tests share it.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
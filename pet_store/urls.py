@@ -21,6 +21,8 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
 
+from store.metrics import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Pet Store API",
@@ -37,6 +39,7 @@ urlpatterns = [
     path("auth/", include("djoser.urls")),
     path("auth/", include("djoser.urls.jwt")),
     path("", include("store.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),
@@ -0,0 +1,135 @@
+"""
+Async versions of the hottest endpoints, for deployments behind an ASGI
+server: the store listing and detail and bid placement. They return the
+same bodies as the DRF viewsets (`StorePetSerializer` and `BidSerializer`
+shapes) and apply the same authentication and bid rules, but a request
+waiting on the database or on a slow client does not hold a thread.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import exceptions, serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import timed_serialization
+from .models import Auction
+from .pagination import KeysetPagination
+from .projections import StorePetProjection
+from .serializers import BidSerializer, check_new_bid, save_new_bid
+from .views import StorePetViewSet
+
+
+class BidInputSerializer(serializers.Serializer):
+    # The auction is looked up by the view with the async ORM; a
+    # PrimaryKeyRelatedField would query synchronously.
+    auction = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=6, decimal_places=2)
+
+
+@require_GET
+async def store_list(request):
+    request = Request(request)
+    projection = StorePetProjection()
+    paginator = KeysetPagination()
+    try:
+        page = await paginator.apaginate_queryset(
+            projection.values(StorePetViewSet.queryset), request
+        )
+    except exceptions.APIException as exc:
+        return _error_response(exc)
+    with timed_serialization():
+        data = await projection.arepresent(page)
+    return _json_response(paginator.get_paginated_response(data).data)
+
+
+@require_GET
+async def store_detail(request, pk):
+    projection = StorePetProjection()
+    queryset = projection.values(StorePetViewSet.queryset.filter(pk=pk))
+    rows = [row async for row in queryset]
+    if not rows:
+        return _error_response(exceptions.NotFound("No Pet matches the given query."))
+    with timed_serialization():
+        data = await projection.arepresent(rows)
+    return _json_response(data[0])
+
+
+@csrf_exempt
+@require_POST
+async def place_bid(request):
+    authentication = JWTAuthentication()
+    try:
+        user = await _authenticate(authentication, request)
+        if user is None:
+            raise exceptions.NotAuthenticated()
+
+        data = Request(
+            request,
+            parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+        ).data
+        serializer = BidInputSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        auction_id = serializer.validated_data["auction"]
+        price = serializer.validated_data["price"]
+
+        auction = await (
+            Auction.objects.select_related("pet").filter(pk=auction_id).afirst()
+        )
+        if auction is None:
+            message = serializers.PrimaryKeyRelatedField.default_error_messages[
+                "does_not_exist"
+            ]
+            raise serializers.ValidationError(
+                {"auction": [message.format(pk_value=auction_id)]}
+            )
+        check_new_bid(auction, user, price)
+        # The async ORM has no transactions yet: the insert and the
+        # leaderboard update run together in a thread.
+        bid = await sync_to_async(save_new_bid)(auction, user, price)
+    except exceptions.APIException as exc:
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = authentication.authenticate_header(request)
+        return _error_response(exc)
+
+    with timed_serialization():
+        data = BidSerializer(bid).data
+    return _json_response(data, status=status.HTTP_201_CREATED)
+
+
+async def _authenticate(authentication, request):
+    # JWTAuthentication.authenticate(), with the user lookup off the loop.
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+    return await sync_to_async(authentication.get_user)(validated_token)
+
+
+def _json_response(data, status=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def _error_response(exc):
+    response = exception_handler(exc, {})
+    # Keep the headers DRF adds for the exception (WWW-Authenticate,
+    # Retry-After), not the default content type of an unrendered response.
+    headers = {
+        name: value for name, value in response.items() if name != "Content-Type"
+    }
+    return _json_response(response.data, status=response.status_code, headers=headers)
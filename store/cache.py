@@ -0,0 +1,84 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+CATALOG_VERSION_KEY = "store:catalog:version"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Start from the clock rather than 1 so an evicted version key can
+        # never bring back entries cached under an older version.
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached catalog response. Called once the surrounding
+    transaction commits, so readers never cache uncommitted data under the
+    new version.
+    """
+
+    def bump():
+        try:
+            cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+    transaction.on_commit(bump)
+
+
+def catalog_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def _cache_key(request):
+    path = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"store:catalog:{get_catalog_version()}:{request.accepted_media_type}:{path}"
+
+
+class CatalogCacheMixin:
+    """
+    Serve `list` and `retrieve` from the cache, keyed by the catalog version
+    so any write to the catalog makes every entry unreachable at once.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
+
+    def _cached(self, request, view, *args, **kwargs):
+        key = _cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _record("hits")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _record("misses")
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.STORE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,213 @@
+"""
+Live events for Server-Sent Events streams.
+
+Writers publish an event to a channel once their transaction commits; the
+broker fans it out to every subscription on the channel in this process.
+The event is encoded once, however many streams are watching.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Milliseconds an EventSource waits before reconnecting.
+RETRY_MS = 2000
+
+
+class Event(NamedTuple):
+    # `key` orders the events of a channel; `id` is its text form, sent as
+    # the SSE id and returned by the client in Last-Event-ID.
+    key: tuple
+    id: str
+    name: str
+    data: str
+
+    def encode(self):
+        return f"id: {self.id}\nevent: {self.name}\ndata: {self.data}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only error responses are rendered; streams write their own body.
+        return f"event: error\ndata: {JSONEncoder().encode(data)}\n\n"
+
+
+class Subscription:
+    """
+    The events published to one channel since subscribing, for one stream.
+    Filled from any thread; read by a blocking `get()` or an async `aget()`.
+
+    A stream that falls more than `max_pending` events behind is marked
+    `overflowed` instead of buffering without bound, and should be closed
+    so its client reconnects and resumes with Last-Event-ID.
+    """
+
+    def __init__(self, broker, channel, max_pending):
+        self.broker = broker
+        self.channel = channel
+        self.max_pending = max_pending
+        self.overflowed = False
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._waiter = None
+
+    def put(self, event):
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self.overflowed = True
+            else:
+                self._pending.append(event)
+            self._condition.notify()
+            waiter = self._waiter
+        if waiter is not None:
+            loop, ready = waiter
+            loop.call_soon_threadsafe(ready.set)
+
+    def get(self, timeout):
+        """Wait up to `timeout` seconds for events; return them, oldest first."""
+        with self._condition:
+            if not self._pending and not self.overflowed:
+                self._condition.wait(timeout)
+            return self._take()
+
+    async def aget(self, timeout):
+        with self._condition:
+            if self._pending or self.overflowed:
+                return self._take()
+            ready = asyncio.Event()
+            self._waiter = (asyncio.get_running_loop(), ready)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._condition:
+            self._waiter = None
+            return self._take()
+
+    def _take(self):
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalBroker:
+    """
+    Fan events out to the subscriptions of this process.
+
+    This is the default `STORE_EVENT_BROKER`. A broker shared by several
+    processes (Redis pub/sub, PostgreSQL LISTEN/NOTIFY) subclasses it:
+    `publish()` sends the event to the shared channel, and a listener calls
+    `deliver()` for each event it receives.
+    """
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.max_pending)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel, event):
+        self.deliver(channel, event)
+
+    def deliver(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.STORE_EVENT_BROKER)()
+
+
+def publish_on_commit(channel, event):
+    """Publish `event` once the surrounding transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(channel, event))
+
+
+def stream_events(channel, backlog, last_key=None, start_id=None):
+    """
+    Yield an SSE stream of the events published to `channel`. When the
+    client resumes after `last_key`, the events it missed are first read
+    with `backlog(last_key)`; live events it already got are skipped.
+
+    `start_id` is sent as the id of an empty event, so a client that
+    reconnects before receiving any event still resumes from there.
+    """
+    with get_broker().subscribe(channel) as subscription:
+        yield _preamble(start_id)
+        events = backlog(last_key) if last_key is not None else []
+        while True:
+            for event in events:
+                if last_key is None or event.key > last_key:
+                    last_key = event.key
+                    yield event.encode()
+            if subscription.overflowed:
+                return
+            events = subscription.get(settings.STORE_EVENTS_KEEPALIVE)
+            if not events and not subscription.overflowed:
+                # Keeps proxies from timing the stream out and lets the
+                # server notice clients that went away.
+                yield ": keepalive\n\n"
+
+
+async def astream_events(channel, backlog, last_key=None, start_id=None):
+    """`stream_events()` for ASGI, with an async `backlog`."""
+    with get_broker().subscribe(channel) as subscription:
+        yield _preamble(start_id)
+        events = await backlog(last_key) if last_key is not None else []
+        while True:
+            for event in events:
+                if last_key is None or event.key > last_key:
+                    last_key = event.key
+                    yield event.encode()
+            if subscription.overflowed:
+                return
+            events = await subscription.aget(settings.STORE_EVENTS_KEEPALIVE)
+            if not events and not subscription.overflowed:
+                yield ": keepalive\n\n"
+
+
+def _preamble(start_id):
+    preamble = f"retry: {RETRY_MS}\n"
+    if start_id is not None:
+        preamble += f"id: {start_id}\n"
+    return preamble + "\n"
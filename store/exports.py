@@ -0,0 +1,62 @@
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+CHUNK_SIZE = 2000
+
+
+class JSONLinesRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "jsonl"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only error responses are rendered; exports stream their own body.
+        return json.dumps(data, cls=JSONEncoder) + "\n"
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return "".join(iter_csv([data], list(data)))
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, serializer, chunk_size=CHUNK_SIZE):
+    """
+    Serialize `queryset` row by row, fetching `chunk_size` rows (and their
+    prefetched relations) at a time.
+    """
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(instance)
+
+
+def iter_jsonl(rows):
+    encoder = JSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def iter_csv(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_cell(row[column]) for column in columns])
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    # Nested objects, lists and booleans keep their JSON form.
+    return json.dumps(value, cls=JSONEncoder)
@@ -0,0 +1,181 @@
+import codecs
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .cache import bump_catalog_version
+from .models import Category, Pet, Tags
+
+READ_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+
+
+class MalformedInput(ValueError):
+    pass
+
+
+def iter_records(stream, read_size=READ_SIZE, max_record_size=MAX_RECORD_SIZE):
+    """
+    Yield the records of a JSON array or of JSON Lines read from a binary
+    `stream`, holding at most one record (plus one read) in memory.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+    record = 0
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(read_size) if not eof else b""
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + text.decode(chunk or b"", final=eof)
+        position = 0
+
+    while True:
+        # Skip whitespace, plus the separators when reading an array.
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n" + (
+                "," if in_array else ""
+            ):
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            fill()
+
+        if position >= len(buffer):
+            if in_array:
+                raise MalformedInput("Unterminated JSON array")
+            return
+        if in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+                continue
+        if in_array and buffer[position] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise MalformedInput(f"Invalid JSON in record {record}: {exc.msg}")
+            complete = False
+        if not complete:
+            if len(buffer) - position > max_record_size:
+                raise MalformedInput(
+                    f"Record {record} is larger than {max_record_size} bytes"
+                )
+            fill()
+            continue
+
+        yield value
+        record += 1
+        position = end
+
+
+class PetImportSerializer(serializers.ModelSerializer):
+    # Related ids are checked for a whole batch at once in `import_pets`.
+    category = serializers.IntegerField()
+    tags = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = Pet
+        fields = [
+            "name",
+            "age",
+            "status",
+            "price",
+            "category",
+            "tags",
+        ]
+
+
+def import_pets(records, owner, batch_size=1000, max_errors=100):
+    """
+    Validate and insert `records` in batches: one query per batch for the
+    referenced categories and tags, one bulk INSERT for the pets and one
+    for their tags. Invalid rows are skipped and reported by row number.
+    """
+    result = {"created": 0, "failed": 0, "errors": []}
+    validator = PetImportSerializer()
+    records = iter(records)
+    row = 0
+
+    done = False
+    while not done:
+        batch = []
+        try:
+            batch.extend(islice(records, batch_size))
+        except MalformedInput as exc:
+            # Rows read before the syntax error are still imported.
+            _report(result, row + len(batch), [str(exc)], max_errors)
+            done = True
+        done = done or len(batch) < batch_size
+
+        rows = []
+        for data in batch:
+            try:
+                rows.append((row, validator.run_validation(data)))
+            except serializers.ValidationError as exc:
+                _report(result, row, exc.detail, max_errors)
+            row += 1
+
+        categories = set(
+            Category.objects.filter(
+                pk__in={data["category"] for _, data in rows}
+            ).values_list("pk", flat=True)
+        )
+        tags = set(
+            Tags.objects.filter(
+                pk__in={tag for _, data in rows for tag in data.get("tags", [])}
+            ).values_list("pk", flat=True)
+        )
+
+        pets = []
+        pet_tags = []
+        for number, data in rows:
+            errors = {}
+            if data["category"] not in categories:
+                errors["category"] = [_does_not_exist(data["category"])]
+            missing = [tag for tag in data.get("tags", []) if tag not in tags]
+            if missing:
+                errors["tags"] = [_does_not_exist(tag) for tag in missing]
+            if errors:
+                _report(result, number, errors, max_errors)
+                continue
+            tag_ids = data.pop("tags", [])
+            data["category_id"] = data.pop("category")
+            pets.append(Pet(owner=owner, **data))
+            pet_tags.append(set(tag_ids))
+
+        if not pets:
+            continue
+        with transaction.atomic():
+            Pet.objects.bulk_create(pets)
+            Pet.tags.through.objects.bulk_create(
+                Pet.tags.through(pet_id=pet.pk, tags_id=tag)
+                for pet, tag_ids in zip(pets, pet_tags)
+                for tag in tag_ids
+            )
+            bump_catalog_version()
+        result["created"] += len(pets)
+
+    result["errors"].sort(key=lambda error: error["row"])
+    return result
+
+
+def _report(result, row, errors, max_errors):
+    result["failed"] += 1
+    if len(result["errors"]) < max_errors:
+        result["errors"].append({"row": row, "errors": errors})
+
+
+def _does_not_exist(pk):
+    return f'Invalid pk "{pk}" - object does not exist.'
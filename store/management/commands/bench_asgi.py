@@ -0,0 +1,223 @@
+import asyncio
+import io
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from store.models import Pet
+
+# Each mode serves the same data through one handler and one set of views.
+MODES = {
+    "wsgi": ("DRF views on WSGI threads", "/store/"),
+    "asgi": ("async views on the event loop", "/async/store/"),
+    "asgi-sync": ("DRF views on ASGI, run in a thread", "/store/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the store list and detail routes served "
+        "by WSGI worker threads and by the ASGI event loop, with concurrent "
+        "clients that take --latency seconds to send each request. Runs in "
+        "process against the current database (fill it with seed_store) and "
+        "only reads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--clients", type=int, default=50)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="WSGI worker threads, as a threaded server would run.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Seconds a client takes to send its request.",
+        )
+        parser.add_argument(
+            "--modes", nargs="+", choices=list(MODES), default=list(MODES)
+        )
+
+    def handle(self, *args, **options):
+        pet = Pet.objects.filter(status=True).order_by("-created_at", "-id").first()
+        if pet is None:
+            raise CommandError("There are no pets for sale: run seed_store first.")
+
+        # Expected 4xx responses would otherwise be logged on every call.
+        logger = logging.getLogger("django.request")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            # STORE_CACHE_TIMEOUT=0: time the views, not the response cache
+            # only the DRF viewsets have.
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                STORE_CACHE_TIMEOUT=0,
+            ):
+                for mode in options["modes"]:
+                    description, prefix = MODES[mode]
+                    self.stdout.write(f"{mode}: {description}")
+                    for route, path in (
+                        ("list", prefix),
+                        ("detail", f"{prefix}{pet.id}/"),
+                    ):
+                        self.bench(mode, route, path, options)
+        finally:
+            logger.setLevel(level)
+
+    def bench(self, mode, route, path, options):
+        if mode == "wsgi":
+            latencies, elapsed, statuses = run_wsgi(path, options)
+        else:
+            latencies, elapsed, statuses = asyncio.run(run_asgi(path, options))
+        if statuses != {200}:
+            raise CommandError(f"{path} answered {sorted(statuses)}")
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"  {route:8} {len(latencies) / elapsed:9.1f} req/s "
+            f"p50 {statistics.median(latencies) * 1000:8.1f} ms "
+            f"p95 {p95 * 1000:8.1f} ms"
+        )
+
+
+def run_wsgi(path, options):
+    """
+    `--clients` client threads share a pool of `--threads` workers. A
+    worker is held while its client sends the request, as in a threaded
+    WSGI server.
+    """
+    handler = WSGIHandler()
+    latency = options["latency"]
+    remaining = iter(range(options["requests"]))
+    lock = threading.Lock()
+    latencies, statuses = [], set()
+
+    def serve():
+        time.sleep(latency)
+        status = []
+        response = handler(
+            _environ(path), lambda code, headers: status.append(int(code[:3]))
+        )
+        for _ in response:
+            pass
+        response.close()
+        return status[0]
+
+    def client(pool):
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            status = pool.submit(serve).result()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses.add(status)
+
+    with ThreadPoolExecutor(options["threads"]) as pool:
+        clients = [
+            threading.Thread(target=client, args=(pool,))
+            for _ in range(options["clients"])
+        ]
+        start = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed, statuses
+
+
+async def run_asgi(path, options):
+    """
+    `--clients` concurrent tasks on one event loop. A client sending its
+    request only holds the loop while it awaits `receive()`.
+    """
+    application = get_asgi_application()
+    latency = options["latency"]
+    remaining = iter(range(options["requests"]))
+    latencies, statuses = [], set()
+
+    async def serve():
+        sent = False
+        finished = asyncio.Event()
+        status = []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                await asyncio.sleep(latency)
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Django listens for a disconnect while the view runs.
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif not message.get("more_body"):
+                finished.set()
+
+        await application(_scope(path), receive, send)
+        return status[0]
+
+    async def client():
+        while next(remaining, None) is not None:
+            start = time.perf_counter()
+            statuses.add(await serve())
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(options["clients"])))
+    return latencies, time.perf_counter() - start, statuses
+
+
+def _environ(path):
+    path, _, query = path.partition("?")
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.url_scheme": "http",
+        "wsgi.errors": io.StringIO(),
+    }
+
+
+def _scope(path):
+    path, _, query = path.partition("?")
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
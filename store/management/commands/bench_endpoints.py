@@ -0,0 +1,283 @@
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from store.models import Auction, Bid, Pet, Tags
+from store.seeding import StoreSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the store at increasing scales and time every route through "
+        "the test client. Writes latency, query count and peak memory per "
+        "route to a JSON file; --compare reports regressions against an "
+        "earlier run. Everything is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", type=int, nargs="+", default=[1000, 100000, 1000000]
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench_results.json")
+        parser.add_argument(
+            "--skip",
+            nargs="*",
+            default=[],
+            help="Skip the routes whose path contains any of these strings.",
+        )
+        parser.add_argument("--compare", help="Results file of an earlier run.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.25,
+            help="Median latency ratio reported as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        results = {
+            "created_at": timezone.now().isoformat(),
+            "seed": options["seed"],
+            "repeat": options["repeat"],
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": (
+                f"{connection.vendor} {connection.Database.sqlite_version}"
+                if connection.vendor == "sqlite"
+                else connection.vendor
+            ),
+            "scales": {},
+        }
+        seeder = StoreSeeder(seed=options["seed"])
+        # Expected 4xx responses would otherwise be logged on every call.
+        logger = logging.getLogger("django.request")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ), transaction.atomic():
+                seeded = 0
+                for scale in sorted(options["scales"]):
+                    start = time.perf_counter()
+                    seeder.seed(scale - seeded)
+                    seeded = scale
+                    self.stdout.write(
+                        f"seeded {scale} pets in {time.perf_counter() - start:.1f}s"
+                    )
+                    routes = self.bench_scale(options)
+                    results["scales"][str(scale)] = {"routes": routes}
+                transaction.set_rollback(True)
+        finally:
+            logger.setLevel(level)
+
+        with open(options["output"], "w") as output:
+            json.dump(results, output, indent=2)
+        self.stdout.write(f"results written to {options['output']}")
+
+        if options["compare"]:
+            self.compare(options["compare"], results, options["threshold"])
+
+    def bench_scale(self, options):
+        context = self.fixtures()
+        routes = {}
+        for name, user, method, path, data in self.routes(context):
+            if any(skip in name for skip in options["skip"]):
+                continue
+            client = APIClient()
+            if user is not None:
+                client.force_authenticate(user=user)
+
+            def call():
+                cache.clear()
+                # Every request is rolled back, so writes can be repeated and
+                # never change what the following routes see.
+                with transaction.atomic():
+                    start = time.perf_counter()
+                    response = getattr(client, method)(path, data, **_body(data))
+                    if response.streaming:
+                        for _ in response.streaming_content:
+                            pass
+                    elapsed = time.perf_counter() - start
+                    transaction.set_rollback(True)
+                return response, elapsed
+
+            # Exports read whole tables, so they are timed once, unwarmed.
+            repeat = 1 if name.startswith("GET /export/") else options["repeat"]
+            if repeat > 1:
+                call()
+            latencies = [call()[1] for _ in range(repeat)]
+
+            # Queries and memory are measured on their own run: both
+            # instruments slow the request down.
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as queries:
+                response, _ = call()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            routes[name] = {
+                "status": response.status_code,
+                "median_ms": round(statistics.median(latencies) * 1000, 3),
+                "min_ms": round(min(latencies) * 1000, 3),
+                "max_ms": round(max(latencies) * 1000, 3),
+                "queries": len(queries),
+                "peak_memory_kb": round(peak / 1024, 1),
+            }
+            self.stdout.write(
+                f"  {name:45} {response.status_code} "
+                f"{routes[name]['median_ms']:10.2f} ms {len(queries):4} queries "
+                f"{routes[name]['peak_memory_kb']:10.1f} KiB"
+            )
+        return routes
+
+    def fixtures(self):
+        """
+        Pick the busiest open auction and its owner as the subject of the
+        detail routes, and add the users and the pet the write routes need.
+        """
+        User = get_user_model()
+        auction = (
+            Auction.objects.filter(
+                end_date__gt=timezone.now(), bid_count__gt=0, pet__status=True
+            )
+            .select_related("pet__owner")
+            .order_by("-bid_count", "id")
+            .first()
+        )
+        if auction is None:
+            raise CommandError("The scale is too small to have an open auction.")
+        owner = auction.pet.owner
+        bid = Bid.objects.filter(auction=auction).order_by("id").first()
+        admin = User.objects.create(
+            username=f"bench_admin_{time.time_ns()}", is_staff=True
+        )
+        spare = Pet.objects.create(
+            owner=owner,
+            name="Bench spare",
+            age=1,
+            price="100.00",
+            category=auction.pet.category,
+        )
+        return {
+            "tag": Tags.objects.order_by("id").first(),
+            "owner": owner,
+            "bidder": bid.bidder,
+            "admin": admin,
+            "pet": auction.pet,
+            "auction": auction,
+            "bid": bid,
+            "spare": spare,
+        }
+
+    def routes(self, context):
+        owner, bidder, admin = context["owner"], context["bidder"], context["admin"]
+        pet, auction, bid = context["pet"], context["auction"], context["bid"]
+        now = timezone.now()
+        new_pet = {
+            "name": "Bench",
+            "age": 2,
+            "status": True,
+            "price": "120.00",
+            "category": pet.category_id,
+            "tags": [context["tag"].id],
+        }
+        imported = "\n".join(json.dumps(new_pet) for _ in range(100))
+        return [
+            ("GET /store/", None, "get", "/store/", None),
+            ("GET /store/?page_size=100", None, "get", "/store/?page_size=100", None),
+            ("GET /store/{id}/", None, "get", f"/store/{pet.id}/", None),
+            ("GET /store/cache-stats/", admin, "get", "/store/cache-stats/", None),
+            ("GET /pets/", owner, "get", "/pets/", None),
+            ("POST /pets/", owner, "post", "/pets/", new_pet),
+            ("GET /pets/{id}/", owner, "get", f"/pets/{pet.id}/", None),
+            ("PATCH /pets/{id}/", owner, "patch", f"/pets/{pet.id}/", {"age": 3}),
+            ("POST /pets/import/", owner, "post", "/pets/import/", imported),
+            ("GET /pets/{id}/bids/", owner, "get", f"/pets/{pet.id}/bids/", None),
+            (
+                "GET /pets/{id}/bids/{id}/",
+                owner,
+                "get",
+                f"/pets/{pet.id}/bids/{bid.id}/",
+                None,
+            ),
+            ("GET /auction/", owner, "get", "/auction/", None),
+            ("GET /auction/{id}/", owner, "get", f"/auction/{auction.id}/", None),
+            (
+                "POST /auction/",
+                owner,
+                "post",
+                "/auction/",
+                {
+                    "pet": context["spare"].id,
+                    "start_price": "100.00",
+                    "start_date": now.isoformat(),
+                    "end_date": (now + timedelta(days=1)).isoformat(),
+                },
+            ),
+            ("GET /bid/", bidder, "get", "/bid/", None),
+            ("GET /bid/{id}/", bidder, "get", f"/bid/{bid.id}/", None),
+            (
+                "POST /bid/",
+                admin,
+                "post",
+                "/bid/",
+                {"auction": auction.id, "price": str(auction.current_price + 1)},
+            ),
+            (
+                "PATCH /bid/{id}/",
+                bidder,
+                "patch",
+                f"/bid/{bid.id}/",
+                {"price": str(auction.current_price + 1)},
+            ),
+            ("GET /export/pets/", owner, "get", "/export/pets/", None),
+            ("GET /export/auctions/", owner, "get", "/export/auctions/", None),
+            ("GET /export/bids/", owner, "get", "/export/bids/", None),
+            ("GET /metrics", None, "get", "/metrics", None),
+        ]
+
+    def compare(self, path, results, threshold):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = []
+        for scale, current in results["scales"].items():
+            previous = baseline["scales"].get(scale, {}).get("routes", {})
+            for name, route in current["routes"].items():
+                if name not in previous:
+                    continue
+                before, after = previous[name], route
+                ratio = after["median_ms"] / max(before["median_ms"], 0.001)
+                if ratio > threshold or after["queries"] > before["queries"]:
+                    regressions.append(
+                        f"{scale:>8} {name:45} {before['median_ms']:.2f} -> "
+                        f"{after['median_ms']:.2f} ms (x{ratio:.2f}), "
+                        f"{before['queries']} -> {after['queries']} queries"
+                    )
+        if regressions:
+            self.stdout.write("\n".join(regressions))
+            raise CommandError(f"{len(regressions)} regressions against {path}")
+        self.stdout.write(f"no regressions against {path}")
+
+
+def _body(data):
+    if isinstance(data, str):
+        return {"content_type": "application/x-ndjson"}
+    if data is not None:
+        return {"format": "json"}
+    return {}
@@ -0,0 +1,110 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from store.models import Auction, Bid, Category, Pet, Tags
+from store.projections import PetProjection, StorePetProjection
+from store.serializers import PetSerializer, StorePetSerializer
+from store.views import PetViewSet, StorePetViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the CPU time per 1,000 rows of the serializer and the "
+        "projection list paths. Seeds its own rows and rolls them back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with transaction.atomic():
+            owner = self.seed(rows)
+            view = PetViewSet(request=SimpleNamespace(user=owner), action="list")
+            cases = [
+                (
+                    "store",
+                    StorePetViewSet.queryset,
+                    StorePetSerializer,
+                    StorePetProjection,
+                ),
+                ("pets", view.get_queryset(), PetSerializer, PetProjection),
+            ]
+            for name, queryset, serializer_class, projection_class in cases:
+                queryset = queryset.order_by("-created_at", "-id")
+                projection = projection_class()
+
+                def serialize():
+                    return serializer_class(list(queryset[:rows]), many=True).data
+
+                def project():
+                    page = list(projection.values(queryset)[:rows])
+                    return projection.represent(page)
+
+                before = self.cpu_time(serialize, options["repeat"]) * 1000 / rows
+                after = self.cpu_time(project, options["repeat"]) * 1000 / rows
+                self.stdout.write(
+                    f"{name:6} serializer {before * 1000:8.2f} ms/1000 rows   "
+                    f"projection {after * 1000:8.2f} ms/1000 rows   "
+                    f"x{before / after:.1f}"
+                )
+            transaction.set_rollback(True)
+
+    def cpu_time(self, run, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.process_time()
+            run()
+            elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def seed(self, rows):
+        User = get_user_model()
+        owner = User.objects.create(username=f"bench_owner_{time.time_ns()}")
+        bidders = User.objects.bulk_create(
+            User(username=f"bench_bidder_{time.time_ns()}_{i}") for i in range(5)
+        )
+        category = Category.objects.create(name="Bench")
+        tags = Tags.objects.bulk_create(Tags(name=f"Bench {i}") for i in range(3))
+        pets = Pet.objects.bulk_create(
+            Pet(
+                owner=owner,
+                name=f"Bench {i}",
+                age=i % 15,
+                price="100.00",
+                category=category,
+            )
+            for i in range(rows)
+        )
+        Pet.tags.through.objects.bulk_create(
+            Pet.tags.through(pet_id=pet.pk, tags_id=tag.pk)
+            for pet in pets
+            for tag in tags[: pet.pk % 4]
+        )
+        now = timezone.now()
+        auctions = Auction.objects.bulk_create(
+            Auction(
+                pet=pet,
+                start_price="100.00",
+                start_date=now,
+                end_date=now + timedelta(days=1),
+            )
+            for pet in pets[::2]
+        )
+        Bid.objects.bulk_create(
+            Bid(auction=auction, bidder=bidder, price="110.00")
+            for auction in auctions
+            for bidder in bidders[: auction.pk % 6]
+        )
+        Auction.objects.filter(
+            pk__in=[auction.pk for auction in auctions]
+        ).rebuild_leaderboard()
+        return owner
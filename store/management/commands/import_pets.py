@@ -0,0 +1,41 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from store.importers import import_pets, iter_records
+
+
+class Command(BaseCommand):
+    help = "Import pets from a JSON array or JSON Lines file ('-' reads stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="Username of the owner.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['owner']!r} does not exist")
+
+        stream = (
+            sys.stdin.buffer if options["path"] == "-" else open(options["path"], "rb")
+        )
+        try:
+            result = import_pets(
+                iter_records(stream), owner=owner, batch_size=options["batch_size"]
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} pet(s), {result['failed']} row(s) failed."
+            )
+        )
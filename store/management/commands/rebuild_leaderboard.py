@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from store.models import Auction
+
+
+class Command(BaseCommand):
+    help = "Recompute current_price, leader and bid_count of auctions from their bids."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "auctions", nargs="*", type=int, help="Only rebuild these auction ids."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        auctions = Auction.objects.order_by("pk")
+        if options["auctions"]:
+            auctions = auctions.filter(pk__in=options["auctions"])
+
+        rebuilt = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                auctions.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                rebuilt += Auction.objects.filter(pk__in=batch).rebuild_leaderboard()
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} auction(s)."))
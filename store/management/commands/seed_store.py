@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from store.seeding import StoreSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the store with synthetic users, categories, tags, pets, auctions "
+        "and bids. The same --seed always generates the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pets", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--pets-per-user", type=int, default=10)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument(
+            "--max-tags-per-pet",
+            type=int,
+            default=3,
+            help="Each pet gets 0 to this many tags.",
+        )
+        parser.add_argument(
+            "--auction-ratio",
+            type=float,
+            default=0.3,
+            help="Share of the pets put up for auction.",
+        )
+        parser.add_argument(
+            "--bid-skew",
+            type=float,
+            default=1.2,
+            help="Pareto shape of the bids per auction; lower is more skewed.",
+        )
+        parser.add_argument("--max-bids", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=100000)
+        parser.add_argument("--password", default="pet-store")
+
+    def handle(self, *args, **options):
+        seeder = StoreSeeder(
+            seed=options["seed"],
+            pets_per_user=options["pets_per_user"],
+            categories=options["categories"],
+            tags=options["tags"],
+            max_tags_per_pet=options["max_tags_per_pet"],
+            auction_ratio=options["auction_ratio"],
+            bid_skew=options["bid_skew"],
+            max_bids=options["max_bids"],
+            batch_size=options["batch_size"],
+            password=options["password"],
+        )
+        start = time.perf_counter()
+        counts = seeder.seed(options["pets"])
+        elapsed = time.perf_counter() - start
+
+        rows = sum(counts.values())
+        self.stdout.write(
+            ", ".join(f"{count} {name}" for name, count in counts.items())
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {rows} row(s) in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,279 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+from .cache import catalog_cache_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_current = ContextVar("store_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counters collected while a single request is being handled."""
+
+    __slots__ = ("queries", "db_time", "serializer_time", "_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._depth = 0
+
+
+def _record_query(execute, sql, params, many, context):
+    # Installed once on every connection. The request is found through a
+    # context variable, which `sync_to_async` carries over to the thread
+    # running the async ORM's queries.
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def _install(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@receiver(connection_created)
+def _install_on_connect(sender, connection, **kwargs):
+    _install(connection)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Add the time spent in the block to the current request's serializer
+    time. Queries run inside the block are counted as DB time only, and
+    nested blocks (a list serializer calling its child) are counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics._depth:
+        yield
+        return
+
+    metrics._depth += 1
+    db_time = metrics.db_time
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth -= 1
+        elapsed = time.perf_counter() - start - (metrics.db_time - db_time)
+        metrics.serializer_time += elapsed
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow; made cumulative on export.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """
+    In-process aggregate of the request metrics, keyed by view and method.
+    Each process exposes its own numbers; Prometheus sums them per target.
+    """
+
+    histograms = (
+        (
+            "store_request_duration_seconds",
+            "Time spent handling the request.",
+            LATENCY_BUCKETS,
+        ),
+        (
+            "store_request_db_duration_seconds",
+            "Time spent executing SQL queries.",
+            LATENCY_BUCKETS,
+        ),
+        (
+            "store_request_serializer_duration_seconds",
+            "Time spent building the response data, excluding SQL.",
+            LATENCY_BUCKETS,
+        ),
+        ("store_request_queries", "SQL queries per request.", QUERY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._series = {}
+            self._responses = {}
+
+    def observe(self, view, method, status_code, metrics, duration):
+        key = (view, method)
+        values = (duration, metrics.db_time, metrics.serializer_time, metrics.queries)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [
+                    Histogram(buckets) for _, _, buckets in self.histograms
+                ]
+            for histogram, value in zip(series, values):
+                histogram.observe(value)
+            response_key = (view, method, status_code)
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+
+    def render(self):
+        lines = [
+            "# HELP store_requests_total Requests handled, by response status.",
+            "# TYPE store_requests_total counter",
+        ]
+        with self._lock:
+            for (view, method, code), count in sorted(self._responses.items()):
+                labels = _labels(view=view, method=method, status=code)
+                lines.append(f"store_requests_total{{{labels}}} {count}")
+
+            for index, (name, help_text, _) in enumerate(self.histograms):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (view, method), series in sorted(self._series.items()):
+                    histogram = series[index]
+                    labels = _labels(view=view, method=method)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        stats = catalog_cache_stats()
+        for outcome in ("hits", "misses"):
+            name = f"store_catalog_cache_{outcome}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {stats[outcome]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _view_name(request):
+    match = request.resolver_match
+    if match is None:
+        return "unresolved"
+    # DRF viewsets keep the class and the method -> action map on the view
+    # function, which gives labels like "StorePetViewSet.list".
+    cls = getattr(match.func, "cls", None)
+    actions = getattr(match.func, "actions", None)
+    if cls is not None and actions:
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f"{cls.__name__}.{action}"
+    if cls is not None:
+        return cls.__name__
+    return match.view_name or match.func.__qualname__
+
+
+class RequestMetricsMiddleware:
+    """
+    Count the SQL queries and time the DB, the serializers and the whole
+    request, add them as a `Server-Timing` header, and aggregate them for
+    `/metrics`. Disabled with `STORE_REQUEST_METRICS = False`.
+
+    Runs natively under both WSGI and ASGI, so async views never hop to a
+    thread on its account.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.STORE_REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        # Connections opened before this module was imported missed the
+        # connection_created signal.
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    def finish(self, request, response, metrics, start):
+        duration = time.perf_counter() - start
+        response["Server-Timing"] = (
+            f'db;desc="{metrics.queries} queries";dur={metrics.db_time * 1000:.1f}, '
+            f"serializer;dur={metrics.serializer_time * 1000:.1f}, "
+            f"total;dur={duration * 1000:.1f}"
+        )
+        registry.observe(
+            _view_name(request), request.method, response.status_code, metrics, duration
+        )
+        return response
+
+
+def metrics_view(request):
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
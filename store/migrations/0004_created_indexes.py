@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0003_alter_auction_pet'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['created_at', 'id'], name='store_auction_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['created_at', 'id'], name='store_bid_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['created_at', 'id'], name='store_pet_created_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_leaderboard(apps, schema_editor):
+    Auction = apps.get_model("store", "Auction")
+    Bid = apps.get_model("store", "Bid")
+    bids = Bid.objects.filter(auction=OuterRef("pk"))
+    top_bid = bids.order_by("-price", "updated_at", "id")
+    bid_count = bids.order_by().values("auction").annotate(count=Count("id")).values("count")
+    Auction.objects.update(
+        current_price=Subquery(top_bid.values("price")[:1]),
+        leader=Subquery(top_bid.values("bidder")[:1]),
+        bid_count=Coalesce(Subquery(bid_count), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0004_created_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='current_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='leader',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leading_auctions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(populate_leaderboard, migrations.RunPython.noop),
+    ]
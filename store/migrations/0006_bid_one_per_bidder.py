@@ -0,0 +1,48 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:59
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def remove_duplicate_bids(apps, schema_editor):
+    # Keep each bidder's highest bid per auction before enforcing uniqueness.
+    Auction = apps.get_model("store", "Auction")
+    Bid = apps.get_model("store", "Bid")
+    duplicates = (
+        Bid.objects.values("auction", "bidder")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    auctions = set()
+    for duplicate in duplicates:
+        bids = Bid.objects.filter(
+            auction=duplicate["auction"], bidder=duplicate["bidder"]
+        ).order_by("-price", "updated_at", "id")
+        Bid.objects.filter(pk__in=list(bids.values_list("pk", flat=True)[1:])).delete()
+        auctions.add(duplicate["auction"])
+
+    bids = Bid.objects.filter(auction=OuterRef("pk"))
+    top_bid = bids.order_by("-price", "updated_at", "id")
+    bid_count = bids.order_by().values("auction").annotate(count=Count("id")).values("count")
+    Auction.objects.filter(pk__in=auctions).update(
+        current_price=Subquery(top_bid.values("price")[:1]),
+        leader=Subquery(top_bid.values("bidder")[:1]),
+        bid_count=Subquery(bid_count),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0005_auction_leaderboard'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_bids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='bid',
+            constraint=models.UniqueConstraint(fields=('auction', 'bidder'), name='store_bid_one_per_bidder'),
+        ),
+    ]
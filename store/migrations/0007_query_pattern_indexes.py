@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0006_bid_one_per_bidder'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['end_date'], name='store_auction_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['auction', 'created_at', 'id'], name='store_bid_auction_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['auction', '-price', 'updated_at', 'id'], name='store_bid_auction_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['bidder', 'created_at', 'id'], name='store_bid_bidder_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('status', True)), fields=['created_at', 'id'], name='store_pet_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='store_pet_owner_created_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 
 from pet_store import settings
 
@@ -28,18 +30,117 @@ class Pet(models.Model):
     category = models.ForeignKey("Category", on_delete=models.CASCADE)
     tags = models.ManyToManyField("Tags")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="store_pet_created_idx"),
+            # the store only lists available pets, newest first
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(status=True),
+                name="store_pet_available_idx",
+            ),
+            models.Index(
+                fields=["owner", "created_at", "id"], name="store_pet_owner_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class AuctionQuerySet(models.QuerySet):
+    """
+    Keeps the denormalized leaderboard columns (`current_price`, `leader`,
+    `bid_count`) in step with the bids. Each method is a single UPDATE and
+    is meant to run in the same transaction as the bid write it accounts for.
+    """
+
+    def record_bid(self, bid):
+        return self.filter(pk=bid.auction_id).update(
+            bid_count=F("bid_count") + 1, **_outbid_leaderboard(bid)
+        )
+
+    def record_bid_change(self, bid, old_price):
+        if bid.price >= old_price:
+            return self.filter(pk=bid.auction_id).update(**_outbid_leaderboard(bid))
+        # A leader lowering its bid may hand the lead to somebody else.
+        return self.filter(pk=bid.auction_id, leader=bid.bidder_id).update(
+            **_top_bid_leaderboard()
+        )
+
+    def record_bid_removal(self, bid):
+        self.filter(pk=bid.auction_id).update(bid_count=F("bid_count") - 1)
+        return self.filter(pk=bid.auction_id, leader=bid.bidder_id).update(
+            **_top_bid_leaderboard()
+        )
+
+    def rebuild_leaderboard(self):
+        bid_count = (
+            Bid.objects.filter(auction=OuterRef("pk"))
+            .order_by()
+            .values("auction")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return self.update(
+            bid_count=Coalesce(Subquery(bid_count), 0), **_top_bid_leaderboard()
+        )
+
+
+def _outbid_leaderboard(bid):
+    # Ties keep the current leader: the first bidder to reach a price wins.
+    outbid = Q(current_price__isnull=True) | Q(current_price__lt=bid.price)
+    return {
+        "current_price": Case(
+            When(outbid, then=Value(bid.price)),
+            default=F("current_price"),
+            output_field=models.DecimalField(max_digits=6, decimal_places=2),
+        ),
+        "leader": Case(
+            When(outbid, then=Value(bid.bidder_id)),
+            default=F("leader"),
+            output_field=models.BigIntegerField(),
+        ),
+    }
+
+
+def _top_bid_leaderboard():
+    top_bid = Bid.objects.filter(auction=OuterRef("pk")).order_by(
+        "-price", "updated_at", "id"
+    )
+    return {
+        "current_price": Subquery(top_bid.values("price")[:1]),
+        "leader": Subquery(top_bid.values("bidder")[:1]),
+    }
+
+
 class Auction(models.Model):
     pet = models.OneToOneField("Pet", on_delete=models.CASCADE, related_name="auction")
     start_price = models.DecimalField(max_digits=6, decimal_places=2)
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
+    current_price = models.DecimalField(
+        max_digits=6, decimal_places=2, null=True, blank=True
+    )
+    leader = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="leading_auctions",
+    )
+    bid_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AuctionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="store_auction_created_idx"),
+            models.Index(fields=["end_date"], name="store_auction_end_date_idx"),
+        ]
+
     def __str__(self):
         return self.pet.name
 
@@ -51,5 +152,28 @@ class Bid(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="store_bid_created_idx"),
+            models.Index(
+                fields=["auction", "created_at", "id"],
+                name="store_bid_auction_created_idx",
+            ),
+            # the leaderboard's top bid: highest price, first to reach it
+            models.Index(
+                fields=["auction", "-price", "updated_at", "id"],
+                name="store_bid_auction_price_idx",
+            ),
+            models.Index(
+                fields=["bidder", "created_at", "id"],
+                name="store_bid_bidder_created_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["auction", "bidder"], name="store_bid_one_per_bidder"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.bidder.username} - {self.price}"
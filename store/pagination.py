@@ -0,0 +1,164 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on a composite ordering such as
+    `(created_at, id)`.
+
+    The cursor stores the ordering values of the last row of a page, so
+    the next page is a range condition on the index instead of an OFFSET,
+    and no COUNT(*) is ever issued.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` for async views, fetching through the async ORM."""
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset[: self.page_size + 1]])
+
+    def page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.keyset_filter(self.cursor.position, self.reverse)
+            )
+        if self.reverse:
+            return queryset.order_by(*_reverse_ordering(self.ordering))
+        return queryset.order_by(*self.ordering)
+
+    def set_page(self, results):
+        # One extra row was fetched to know whether there is a following page.
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def keyset_filter(self, position, reverse=False):
+        """
+        Build the condition selecting rows strictly after `position` in the
+        ordering (or strictly before it when `reverse` is set).
+
+        The leading field is also bounded on its own so the database can
+        seek into the index and only filter the rows sharing that value.
+        """
+        fields = [field.lstrip("-") for field in self.ordering]
+        lookups = [
+            "lt" if field.startswith("-") != reverse else "gt"
+            for field in self.ordering
+        ]
+
+        after = Q()
+        equal = {}
+        for field, lookup, value in zip(fields, lookups, position):
+            after |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+        leading = Q(**{f"{fields[0]}__{lookups[0]}e": position[0]})
+        return leading & after
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return self.encode_cursor(self.cursor)
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(self.cursor._replace(reverse=True))
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            reverse = bool(tokens["r"])
+            position = list(tokens["p"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"r": int(cursor.reverse), "p": cursor.position}
+        encoded = urlsafe_b64encode(json.dumps(tokens).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        return [
+            _cursor_value(_lookup(instance, field.lstrip("-"))) for field in ordering
+        ]
+
+
+def _reverse_ordering(ordering):
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+    )
+
+
+def _lookup(instance, field):
+    if isinstance(instance, dict):
+        return instance[field]
+    for attr in field.split("__"):
+        instance = getattr(instance, attr)
+    return instance
+
+
+def _cursor_value(value):
+    # Keep full precision: timestamps must round-trip to the microsecond
+    # for the keyset comparison to be exact.
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
@@ -0,0 +1,188 @@
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from .metrics import timed_serialization
+from .models import Bid, Pet
+from .serializers import PetSerializer, StorePetSerializer
+
+
+class Projection:
+    """
+    Builds the same representation as `serializer_class` for a page of
+    rows fetched with `.values()`, so list endpoints skip model instances
+    and per-field serializer calls.
+    """
+
+    serializer_class = None
+    columns = ()
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def represent(self, rows):
+        raise NotImplementedError
+
+    def field(self, name):
+        # Reuse the serializer's own field for the values it formats itself
+        # (decimals, timestamps), so the output is byte-for-byte identical.
+        return self.serializer_class().fields[name].to_representation
+
+
+def _tags_by_pet(pet_ids):
+    return _group_tags(_tags_query(pet_ids))
+
+
+async def _atags_by_pet(pet_ids):
+    return _group_tags([row async for row in _tags_query(pet_ids)])
+
+
+def _tags_query(pet_ids):
+    return (
+        Pet.tags.through.objects.filter(pet_id__in=pet_ids)
+        .order_by("pet_id", "tags_id")
+        .values_list("pet_id", "tags_id", "tags__name")
+    )
+
+
+def _group_tags(rows):
+    tags = defaultdict(list)
+    for pet_id, tag_id, name in rows:
+        tags[pet_id].append({"id": tag_id, "name": name})
+    return tags
+
+
+def _status(value):
+    return "available" if value else "sold"
+
+
+class StorePetProjection(Projection):
+    serializer_class = StorePetSerializer
+    columns = (
+        "id",
+        "name",
+        "age",
+        "status",
+        "price",
+        "created_at",
+        "category_id",
+        "category__name",
+        "owner_id",
+        "owner__username",
+        "auction__id",
+        "auction__bid_count",
+        "auction__current_price",
+        "auction__start_price",
+        "auction__start_date",
+        "auction__end_date",
+    )
+
+    def represent(self, rows):
+        return self.build(rows, _tags_by_pet([row["id"] for row in rows]))
+
+    async def arepresent(self, rows):
+        return self.build(rows, await _atags_by_pet([row["id"] for row in rows]))
+
+    def build(self, rows, tags):
+        price = self.field("price")
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "age": row["age"],
+                "status": _status(row["status"]),
+                "price": price(row["price"]),
+                "category": {"id": row["category_id"], "name": row["category__name"]},
+                "tags": tags[row["id"]],
+                "owner": {"id": row["owner_id"], "username": row["owner__username"]},
+                "isForAuction": _auction(row),
+            }
+            for row in rows
+        ]
+
+
+def _auction(row):
+    if row["auction__id"] is None:
+        return False
+    return {
+        "id": row["auction__id"],
+        "number_of_bids": row["auction__bid_count"],
+        "current_price": row["auction__current_price"],
+        "start_price": row["auction__start_price"],
+        "start_date": row["auction__start_date"],
+        "end_date": row["auction__end_date"],
+    }
+
+
+class PetProjection(Projection):
+    serializer_class = PetSerializer
+    columns = (
+        "id",
+        "owner_id",
+        "owner__username",
+        "name",
+        "age",
+        "status",
+        "price",
+        "created_at",
+        "updated_at",
+        "category_id",
+        "category__name",
+    )
+
+    def represent(self, rows):
+        price = self.field("price")
+        created_at = self.field("created_at")
+        updated_at = self.field("updated_at")
+        pet_ids = [row["id"] for row in rows]
+        tags = _tags_by_pet(pet_ids)
+        bidders = defaultdict(list)
+        bids = (
+            Bid.objects.filter(auction__pet_id__in=pet_ids)
+            .order_by("created_at", "id")
+            .values_list("auction__pet_id", "bidder_id", "bidder__username", "price")
+        )
+        for pet_id, bidder_id, username, bid_price in bids:
+            bidders[pet_id].append(
+                {"id": bidder_id, "username": username, "price": bid_price}
+            )
+        return [
+            {
+                "id": row["id"],
+                "owner": {"id": row["owner_id"], "username": row["owner__username"]},
+                "name": row["name"],
+                "age": row["age"],
+                "status": _status(row["status"]),
+                "price": price(row["price"]),
+                "created_at": created_at(row["created_at"]),
+                "updated_at": updated_at(row["updated_at"]),
+                "category": {"id": row["category_id"], "name": row["category__name"]},
+                "tags": tags[row["id"]],
+                "bidders": bidders[row["id"]],
+            }
+            for row in rows
+        ]
+
+
+class ProjectedListMixin:
+    """
+    Serve `list` through `projection_class` when `STORE_FAST_READS` is on.
+    Detail and write actions keep using the serializer.
+    """
+
+    projection_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.STORE_FAST_READS:
+            return super().list(request, *args, **kwargs)
+
+        projection = self.projection_class()
+        queryset = projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        with timed_serialization():
+            data = projection.represent(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -0,0 +1,318 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .models import Auction, Bid, Category, Pet, Tags
+
+
+class StoreSeeder:
+    """
+    Generate a synthetic store: users, categories, tags, pets with their
+    tags, auctions on a share of the pets and bids whose number per
+    auction follows a heavy-tailed (Pareto) popularity. The same seed
+    always produces the same rows.
+
+    Rows get their primary keys up front so pets, auctions and bids can
+    reference each other without reading anything back. Categories and tags
+    go through `bulk_create`; users, pets, their tags, auctions and bids are
+    built as plain tuples and written with one `executemany` per table and
+    batch, since model instances would cost more than the insert itself.
+    Everything is written in one transaction.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        pets_per_user=10,
+        categories=20,
+        tags=50,
+        max_tags_per_pet=3,
+        auction_ratio=0.3,
+        bid_skew=1.2,
+        max_bids=200,
+        batch_size=10000,
+        password="pet-store",
+        username_prefix="seed_user_",
+    ):
+        self.rng = random.Random(seed)
+        self.pets_per_user = pets_per_user
+        self.categories = categories
+        self.tags = tags
+        self.max_tags_per_pet = max_tags_per_pet
+        self.auction_ratio = auction_ratio
+        self.bid_skew = bid_skew
+        self.max_bids = max_bids
+        self.batch_size = batch_size
+        self.password = password
+        self.username_prefix = username_prefix
+
+    def seed(self, pets):
+        """Create `pets` pets and everything around them; return row counts."""
+        counts = dict.fromkeys(["users", "categories", "tags", "pets", "pet_tags"], 0)
+        counts.update(auctions=0, bids=0)
+        self.now = timezone.now()
+        if settings.USE_TZ:
+            # Rows are written with raw SQL: hand the driver naive UTC values,
+            # as the ORM would.
+            self.now = timezone.make_naive(self.now, dt_timezone.utc)
+        # Adapt each timestamp once, rather than once per column in the driver.
+        self.adapt = connection.ops.adapt_datetimefield_value
+
+        # Every foreign key points at a row created earlier in the same
+        # transaction, so the per-row checks are skipped. SQLite only
+        # honours this outside a transaction and ignores it otherwise.
+        with connection.constraint_checks_disabled():
+            with transaction.atomic(), _deferred_indexes(
+                Pet, Pet.tags.through, Auction, Bid
+            ):
+                self.user_ids = self.create_users(max(2, pets // self.pets_per_user))
+                self.category_ids = self.create_named(
+                    Category, "Category", self.categories
+                )
+                self.tag_ids = self.create_named(Tags, "Tag", self.tags)
+                counts["users"] = len(self.user_ids)
+                counts["categories"] = len(self.category_ids)
+                counts["tags"] = len(self.tag_ids)
+
+                next_pet_id = _next_id(Pet)
+                next_auction_id = _next_id(Auction)
+                for offset in range(0, pets, self.batch_size):
+                    size = min(self.batch_size, pets - offset)
+                    # Pets are a millisecond apart, the last one created now.
+                    created_at = self.now - timedelta(milliseconds=pets - offset)
+                    batch = self.create_batch(
+                        next_pet_id + offset, next_auction_id, size, created_at
+                    )
+                    next_auction_id += batch["auctions"]
+                    for name, count in batch.items():
+                        counts[name] += count
+
+                self.reset_sequences()
+                bump_catalog_version()
+        return counts
+
+    def create_users(self, count):
+        # Every user is a copy of one prepared row with its own id and
+        # username, so the password is hashed once and no instance is built.
+        User = get_user_model()
+        first_id = _next_id(User)
+        fields = list(User._meta.concrete_fields)
+        template = User(password=make_password(self.password))
+        values = [
+            field.get_db_prep_save(field.pre_save(template, True), connection)
+            for field in fields
+        ]
+        id_index = fields.index(User._meta.pk)
+        username_index = fields.index(User._meta.get_field(User.USERNAME_FIELD))
+        rows = []
+        for user_id in range(first_id, first_id + count):
+            values[id_index] = user_id
+            values[username_index] = f"{self.username_prefix}{user_id}"
+            rows.append(tuple(values))
+        _insert(User, [field.name for field in fields], rows)
+        return list(range(first_id, first_id + count))
+
+    def create_named(self, model, label, count):
+        first_id = _next_id(model)
+        model.objects.bulk_create(
+            model(id=first_id + i, name=f"{label} {i + 1}") for i in range(count)
+        )
+        return list(range(first_id, first_id + count))
+
+    def create_batch(self, first_pet_id, first_auction_id, size, created_at):
+        # Draws use int(random() * n) rather than randrange() and choice():
+        # they are the bulk of the Python time per row.
+        random = self.rng.random
+        user_ids, category_ids, tag_ids = self.user_ids, self.category_ids, self.tag_ids
+        users, categories, tags = len(user_ids), len(category_ids), len(tag_ids)
+        tag_choices = self.max_tags_per_pet + 1
+        step = timedelta(milliseconds=1)
+        adapt = self.adapt
+
+        pets, pet_tags, auctions, bids = [], [], [], []
+        for pet_id in range(first_pet_id, first_pet_id + size):
+            owner_id = user_ids[int(random() * users)]
+            timestamp = adapt(created_at)
+            pets.append(
+                (
+                    pet_id,
+                    owner_id,
+                    f"Pet {pet_id}",
+                    int(random() * 20),
+                    random() < 0.9,
+                    _cents(1000 + int(random() * 499000)),
+                    timestamp,
+                    timestamp,
+                    category_ids[int(random() * categories)],
+                )
+            )
+            picked = []
+            for _ in range(int(random() * tag_choices)):
+                tag_id = tag_ids[int(random() * tags)]
+                if tag_id not in picked:
+                    picked.append(tag_id)
+                    pet_tags.append((pet_id, tag_id))
+            if random() < self.auction_ratio:
+                auction_id = first_auction_id + len(auctions)
+                auctions.append(
+                    self.make_auction(auction_id, pet_id, owner_id, timestamp, bids)
+                )
+            created_at += step
+
+        _insert(
+            Pet,
+            [
+                "id",
+                "owner",
+                "name",
+                "age",
+                "status",
+                "price",
+                "created_at",
+                "updated_at",
+                "category",
+            ],
+            pets,
+        )
+        _insert(Pet.tags.through, ["pet", "tags"], pet_tags)
+        _insert(
+            Auction,
+            [
+                "id",
+                "pet",
+                "start_price",
+                "start_date",
+                "end_date",
+                "current_price",
+                "leader",
+                "bid_count",
+                "created_at",
+                "updated_at",
+            ],
+            auctions,
+        )
+        _insert(Bid, ["auction", "bidder", "price", "created_at", "updated_at"], bids)
+        return {
+            "pets": len(pets),
+            "pet_tags": len(pet_tags),
+            "auctions": len(auctions),
+            "bids": len(bids),
+        }
+
+    def make_auction(self, auction_id, pet_id, owner_id, timestamp, bids):
+        rng = self.rng
+        random = rng.random
+        adapt = self.adapt
+        start_cents = 1000 + int(random() * 299000)
+        start_date = self.now - timedelta(seconds=int(random() * 14 * 24 * 3600))
+        end_date = start_date + timedelta(seconds=3600 + int(random() * 20 * 24 * 3600))
+
+        # paretovariate() is >= 1: most auctions get a few bids, a handful
+        # get hundreds.
+        count = min(int(rng.paretovariate(self.bid_skew)) - 1, self.max_bids)
+        current_price = leader_id = None
+        if count:
+            bidders = [
+                bidder_id
+                for bidder_id in rng.sample(
+                    self.user_ids, min(count + 1, len(self.user_ids))
+                )
+                if bidder_id != owner_id
+            ][:count]
+            count = len(bidders)
+            cents = start_cents
+            bid_at = start_date
+            for bidder_id in bidders:
+                cents += 100 + int(random() * 1900)
+                bid_at += timedelta(seconds=1 + int(random() * 3600))
+                bid_timestamp = adapt(bid_at)
+                bids.append(
+                    (auction_id, bidder_id, _cents(cents), bid_timestamp, bid_timestamp)
+                )
+            # Prices only go up, so the last bid leads.
+            if bidders:
+                current_price = _cents(cents)
+                leader_id = bidders[-1]
+
+        return (
+            auction_id,
+            pet_id,
+            _cents(start_cents),
+            adapt(start_date),
+            adapt(end_date),
+            current_price,
+            leader_id,
+            count,
+            timestamp,
+            timestamp,
+        )
+
+    def reset_sequences(self):
+        # Explicit primary keys do not advance PostgreSQL sequences.
+        models = [get_user_model(), Category, Tags, Pet, Auction]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+
+def _cents(cents):
+    # A float is stored as the same value as the matching Decimal (SQLite
+    # keeps decimal columns as REAL) and is much cheaper to build.
+    return cents / 100
+
+
+@contextmanager
+def _deferred_indexes(*models):
+    """
+    On SQLite, drop the secondary indexes of `models` for the block and
+    create them again at the end: one sorted build per index is much
+    faster than updating every index on each insert. Run it inside a
+    transaction, so an error brings the indexes back with the rollback.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    tables = [model._meta.db_table for model in models]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND sql IS NOT NULL AND tbl_name IN (%s)"
+            % ", ".join(["%s"] * len(tables)),
+            tables,
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    yield
+    with connection.cursor() as cursor:
+        for _, sql in indexes:
+            cursor.execute(sql)
+
+
+def _insert(model, fields, rows):
+    if not rows:
+        return
+    opts = model._meta
+    columns = ", ".join(
+        connection.ops.quote_name(opts.get_field(name).column) for name in fields
+    )
+    placeholders = ", ".join(["%s"] * len(fields))
+    sql = f"INSERT INTO {opts.db_table} ({columns}) VALUES ({placeholders})"
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
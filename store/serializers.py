@@ -1,9 +1,18 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from .cache import bump_catalog_version
+from .events import Event, publish_on_commit
+from .metrics import TimedSerializerMixin
 from .models import Auction, Bid, Pet
 from rest_framework import serializers
 
 
-class CreatePetSerializer(serializers.ModelSerializer):
+class CreatePetSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Pet
         fields = [
@@ -17,7 +26,7 @@ class CreatePetSerializer(serializers.ModelSerializer):
         ]
 
 
-class PetSerializer(serializers.ModelSerializer):
+class PetSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
@@ -71,7 +80,7 @@ class PetSerializer(serializers.ModelSerializer):
         return []
 
 
-class StorePetSerializer(serializers.ModelSerializer):
+class StorePetSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
@@ -115,7 +124,8 @@ class StorePetSerializer(serializers.ModelSerializer):
         if has_auction:
             return {
                 "id": obj.auction.id,
-                "number_of_bids": obj.auction.bid_set.count(),
+                "number_of_bids": obj.auction.bid_count,
+                "current_price": obj.auction.current_price,
                 "start_price": obj.auction.start_price,
                 "start_date": obj.auction.start_date,
                 "end_date": obj.auction.end_date,
@@ -123,7 +133,7 @@ class StorePetSerializer(serializers.ModelSerializer):
         return False
 
 
-class AuctionSerializer(serializers.ModelSerializer):
+class AuctionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Auction
@@ -133,9 +143,13 @@ class AuctionSerializer(serializers.ModelSerializer):
             "start_price",
             "start_date",
             "end_date",
+            "current_price",
+            "leader",
+            "bid_count",
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["current_price", "leader", "bid_count"]
 
     def create(self, validated_data):
         pet = validated_data["pet"]
@@ -161,7 +175,7 @@ class AuctionSerializer(serializers.ModelSerializer):
         )
 
 
-class BidSerializer(serializers.ModelSerializer):
+class BidSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Bid
         fields = [
@@ -174,33 +188,9 @@ class BidSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         auction = validated_data["auction"]
-
-        # check if the user is not the owner of the pet
-        if auction.pet.owner == self.context["request"].user:
-            raise serializers.ValidationError("You can't bid on your own pet")
-
-        # check if there is auction for this pet
-        if not hasattr(auction.pet, "auction"):
-            raise serializers.ValidationError("There is no auction for this pet")
-
-        # check if the auction is still open
-        if auction.end_date < timezone.now():
-            raise serializers.ValidationError("The auction is closed")
-
-        # check if the user did not bid on this auction before
-
-        if auction.bid_set.filter(bidder=self.context["request"].user).exists():
-            raise serializers.ValidationError("You already bid on this auction")
-
-        # check if the price is higher than the start price
-        if validated_data["price"] < auction.start_price:
-            raise serializers.ValidationError(
-                "The price must be higher than the start price"
-            )
-
         bidder = self.context["request"].user
-        bid = Bid.objects.create(bidder=bidder, **validated_data)
-        return bid
+        check_new_bid(auction, bidder, validated_data["price"])
+        return save_new_bid(auction, bidder, validated_data["price"])
 
     def update(self, instance, validated_data):
         auction = instance.auction
@@ -216,6 +206,103 @@ class BidSerializer(serializers.ModelSerializer):
                 "The price must be higher than the start price"
             )
 
-        instance.price = validated_data["price"]
-        instance.save()
+        # compare-and-set on the price we validated against, so a concurrent
+        # update or the auction closing in between is never overwritten
+        old_price = instance.price
+        now = timezone.now()
+        with transaction.atomic():
+            updated = Bid.objects.filter(
+                pk=instance.pk, price=old_price, auction__end_date__gte=now
+            ).update(price=validated_data["price"], updated_at=now)
+            if not updated:
+                raise serializers.ValidationError(
+                    "The bid was changed by another request, please retry"
+                )
+            instance.price = validated_data["price"]
+            instance.updated_at = now
+            Auction.objects.record_bid_change(instance, old_price)
+            bump_catalog_version()
+            publish_bid(instance)
         return instance
+
+
+def check_new_bid(auction, bidder, price):
+    """
+    The rules a new bid must pass. Only reads `auction.pet`, so the async
+    views can run it on an auction fetched with `select_related("pet")`.
+    """
+    # check if the user is not the owner of the pet
+    if auction.pet.owner_id == bidder.id:
+        raise serializers.ValidationError("You can't bid on your own pet")
+
+    # check if there is auction for this pet
+    if not hasattr(auction.pet, "auction"):
+        raise serializers.ValidationError("There is no auction for this pet")
+
+    # check if the auction is still open
+    if auction.end_date < timezone.now():
+        raise serializers.ValidationError("The auction is closed")
+
+    # check if the price is higher than the start price
+    if price < auction.start_price:
+        raise serializers.ValidationError(
+            "The price must be higher than the start price"
+        )
+
+
+def save_new_bid(auction, bidder, price):
+    # one bid per bidder is enforced by the unique constraint, so
+    # concurrent requests cannot both pass a check-then-insert
+    try:
+        with transaction.atomic():
+            bid = Bid.objects.create(auction=auction, bidder=bidder, price=price)
+            Auction.objects.record_bid(bid)
+            publish_bid(bid)
+    except IntegrityError:
+        raise serializers.ValidationError("You already bid on this auction")
+    return bid
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def auction_channel(auction_id):
+    return f"auction:{auction_id}"
+
+
+def publish_bid(bid):
+    """Push a new or updated bid to its auction's watchers on commit."""
+    publish_on_commit(auction_channel(bid.auction_id), bid_event(bid))
+
+
+def bid_event(bid):
+    key = bid_event_key(bid.updated_at, bid.id)
+    data = JSONEncoder().encode(BidSerializer(bid).data)
+    return Event(key, format_bid_event_id(key), "bid", data)
+
+
+def bid_event_key(updated_at, bid_id):
+    # Bids are ordered by their last change, so a client resuming from an
+    # event gets every bid created or updated after it.
+    return (updated_at - EPOCH) // timedelta(microseconds=1), bid_id
+
+
+def format_bid_event_id(key):
+    return "%d-%d" % key
+
+
+def parse_bid_event_id(value):
+    try:
+        micros, bid_id = (int(part) for part in value.split("-"))
+    except (AttributeError, ValueError):
+        return None
+    return micros, bid_id
+
+
+def bids_after(queryset, key):
+    """The bids of `queryset` changed after the event `key`, in event order."""
+    micros, bid_id = key
+    updated_at = EPOCH + timedelta(microseconds=micros)
+    return queryset.filter(
+        Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=bid_id)
+    ).order_by("updated_at", "id")
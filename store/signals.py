@@ -0,0 +1,20 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from .models import Auction, Bid, Category, Pet, Tags
+
+
+@receiver(post_save, sender=Pet)
+@receiver(post_save, sender=Auction)
+@receiver(post_save, sender=Bid)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tags)
+@receiver(post_delete, sender=Pet)
+@receiver(post_delete, sender=Auction)
+@receiver(post_delete, sender=Bid)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tags)
+@receiver(m2m_changed, sender=Pet.tags.through)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version()
@@ -1,6 +1,12 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 @pytest.fixture
 def api_client():
-    return APIClient()
\ No newline at end of file
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
@@ -0,0 +1,124 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
+
+from store.models import Auction, Bid, Category, Pet, Tags
+from store.serializers import BidSerializer
+
+
+@pytest.fixture
+def open_auction():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    category = Category.objects.create(name="Test")
+    tag = Tags.objects.create(name="Test")
+    for i in range(3):
+        pet = Pet.objects.create(
+            owner=owner,
+            name=f"Test {i}",
+            age=3,
+            status=True,
+            price="1200.00",
+            category=category,
+        )
+        pet.tags.add(tag)
+    return Auction.objects.create(
+        pet=pet,
+        start_price="1000.00",
+        start_date=timezone.now(),
+        end_date=timezone.now() + timedelta(days=1),
+    )
+
+
+def bid(api_client, auction, price, username="test_bidder"):
+    bidder, _ = get_user_model().objects.get_or_create(username=username)
+    return api_client.post(
+        "/async/bid/",
+        data=json.dumps({"auction": auction.id, "price": price}),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(bidder)}",
+    )
+
+
+@pytest.mark.django_db
+class TestAsyncStore:
+    def test_list_matches_sync_view(self, api_client, open_auction):
+        sync = api_client.get("/store/?page_size=2")
+        response = api_client.get("/async/store/?page_size=2")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == sync.json()["results"]
+        assert response.json()["next"].startswith("http://testserver/async/store/")
+
+    def test_list_cursor_is_followed(self, api_client, open_auction):
+        first = api_client.get("/async/store/?page_size=2").json()
+        second = api_client.get(first["next"]).json()
+        ids = [pet["id"] for pet in first["results"] + second["results"]]
+        assert ids == list(
+            Pet.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_detail_matches_sync_view(self, api_client, open_auction):
+        pet_id = open_auction.pet_id
+        response = api_client.get(f"/async/store/{pet_id}/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == api_client.get(f"/store/{pet_id}/").content
+
+    def test_missing_pet_returns_404(self, api_client):
+        response = api_client.get("/async/store/0/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.content == api_client.get("/store/0/").content
+
+
+@pytest.mark.django_db
+class TestAsyncBid:
+    def test_anonymous_returns_401(self, api_client, open_auction):
+        response = api_client.post(
+            "/async/bid/",
+            data=json.dumps({"auction": open_auction.id, "price": "1200.00"}),
+            content_type="application/json",
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert (
+            response["WWW-Authenticate"] == api_client.get("/bid/")["WWW-Authenticate"]
+        )
+
+    def test_bid_is_created_and_leads(self, api_client, open_auction):
+        response = bid(api_client, open_auction, "1200.00")
+        assert response.status_code == status.HTTP_201_CREATED
+        created = Bid.objects.get()
+        assert response.json() == json.loads(
+            JSONRenderer().render(BidSerializer(created).data)
+        )
+        open_auction.refresh_from_db()
+        assert open_auction.leader == created.bidder
+        assert open_auction.bid_count == 1
+
+    def test_owner_cannot_bid(self, api_client, open_auction):
+        response = bid(api_client, open_auction, "1200.00", username="test_owner")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == ["You can't bid on your own pet"]
+
+    def test_price_below_start_price_returns_400(self, api_client, open_auction):
+        response = bid(api_client, open_auction, "900.00")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_second_bid_returns_400(self, api_client, open_auction):
+        bid(api_client, open_auction, "1200.00")
+        response = bid(api_client, open_auction, "1300.00")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == ["You already bid on this auction"]
+        assert Bid.objects.count() == 1
+
+    def test_unknown_auction_returns_400(self, api_client, open_auction):
+        open_auction.id = 0
+        response = bid(api_client, open_auction, "1200.00")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "auction": ['Invalid pk "0" - object does not exist.']
+        }
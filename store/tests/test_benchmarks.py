@@ -0,0 +1,113 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from store.models import Auction, Pet
+from store.seeding import StoreSeeder
+
+
+@pytest.mark.django_db
+class TestSeeding:
+    def test_same_seed_same_rows(self):
+        def snapshot():
+            return list(
+                Pet.objects.order_by("id").values_list(
+                    "name", "age", "status", "price", "category__name"
+                )
+            )
+
+        counts = StoreSeeder(seed=7).seed(300)
+        first = snapshot()
+        Pet.objects.all().delete()
+        assert StoreSeeder(seed=7).seed(300)["bids"] == counts["bids"]
+        assert snapshot() == first
+
+    def test_leaderboard_matches_bids(self):
+        StoreSeeder(seed=1).seed(300)
+        seeded = list(
+            Auction.objects.order_by("id").values_list(
+                "current_price", "leader", "bid_count"
+            )
+        )
+        Auction.objects.all().rebuild_leaderboard()
+        rebuilt = list(
+            Auction.objects.order_by("id").values_list(
+                "current_price", "leader", "bid_count"
+            )
+        )
+        assert seeded == rebuilt
+
+
+@pytest.mark.django_db
+class TestSeedStore:
+    def test_command_seeds_every_table(self):
+        out = StringIO()
+        call_command("seed_store", "--pets", "500", "--auction-ratio", "1", stdout=out)
+        assert Pet.objects.count() == 500
+        assert Auction.objects.count() == 500
+        assert Pet.tags.through.objects.exists()
+        assert "rows/s" in out.getvalue()
+
+    def test_indexes_are_rebuilt(self):
+        def indexes():
+            with connection.cursor() as cursor:
+                return connection.introspection.get_constraints(
+                    cursor, Pet._meta.db_table
+                ).keys()
+
+        before = set(indexes())
+        call_command("seed_store", "--pets", "50", stdout=StringIO())
+        assert set(indexes()) == before
+
+
+@pytest.mark.django_db
+class TestBenchEndpoints:
+    def test_every_route_is_timed(self, tmp_path):
+        output = tmp_path / "results.json"
+        call_command(
+            "bench_endpoints",
+            "--scales",
+            "300",
+            "--repeat",
+            "1",
+            "--output",
+            str(output),
+            stdout=open(tmp_path / "stdout", "w"),
+        )
+        routes = json.loads(output.read_text())["scales"]["300"]["routes"]
+        assert "GET /pets/{id}/bids/" in routes
+        for name, route in routes.items():
+            assert route["status"] < 400, name
+            assert route["queries"] > 0, name
+            assert route["peak_memory_kb"] > 0, name
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchAsgi:
+    # Worker threads and the async ORM's thread use their own connections,
+    # so the seeded rows must be committed.
+    def test_every_mode_answers(self):
+        StoreSeeder().seed(20)
+        out = StringIO()
+        call_command(
+            "bench_asgi",
+            "--requests",
+            "6",
+            "--clients",
+            "3",
+            "--threads",
+            "2",
+            "--latency",
+            "0",
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        assert [line for line in lines if not line.startswith(" ")] == [
+            "wsgi: DRF views on WSGI threads",
+            "asgi: async views on the event loop",
+            "asgi-sync: DRF views on ASGI, run in a thread",
+        ]
+        assert sum("req/s" in line for line in lines) == 6
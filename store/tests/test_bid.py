@@ -1,9 +1,19 @@
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
 import pytest
 from rest_framework import status
+from rest_framework.test import APIClient
 from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
-from store.models import Category, Tags
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from store.models import Auction, Bid, Category, Pet, Tags
 
 TestPetData = {
     "name": "Test",
@@ -153,3 +163,164 @@ class TestBidEndPoint:
             content_type="application/json",
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.fixture
+def open_auction():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    pet = Pet.objects.create(
+        owner=owner,
+        name="Test",
+        age=3,
+        status=True,
+        price="1200.00",
+        category=Category.objects.create(name="Test"),
+    )
+    return Auction.objects.create(
+        pet=pet,
+        start_price="1000.00",
+        start_date=timezone.now(),
+        end_date=timezone.now() + timedelta(days=1),
+    )
+
+
+def place_bid(api_client, auction, username, price):
+    bidder, _ = get_user_model().objects.get_or_create(username=username)
+    api_client.force_authenticate(user=bidder)
+    return api_client.post(
+        "/bid/",
+        data=json.dumps({"auction": auction.id, "price": price}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+class TestBidLeaderboard:
+    def test_create_bid_updates_leaderboard(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "first", "1100.00")
+        place_bid(api_client, open_auction, "second", "1300.00")
+        place_bid(api_client, open_auction, "third", "1200.00")
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == 3
+        assert open_auction.current_price == Decimal("1300.00")
+        assert open_auction.leader.username == "second"
+
+    def test_equal_bid_keeps_current_leader(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "first", "1100.00")
+        place_bid(api_client, open_auction, "second", "1100.00")
+        open_auction.refresh_from_db()
+        assert open_auction.leader.username == "first"
+
+    def test_leader_lowering_bid_hands_over_lead(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "first", "1100.00")
+        response = place_bid(api_client, open_auction, "second", "1300.00")
+        api_client.put(
+            f"/bid/{response.data['id']}/",
+            data=json.dumps({"auction": open_auction.id, "price": "1050.00"}),
+            content_type="application/json",
+        )
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == 2
+        assert open_auction.current_price == Decimal("1100.00")
+        assert open_auction.leader.username == "first"
+
+    def test_delete_leading_bid_updates_leaderboard(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "first", "1100.00")
+        response = place_bid(api_client, open_auction, "second", "1300.00")
+        api_client.delete(f"/bid/{response.data['id']}/")
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == 1
+        assert open_auction.current_price == Decimal("1100.00")
+        assert open_auction.leader.username == "first"
+
+    def test_rebuild_leaderboard_command_fixes_drift(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "first", "1100.00")
+        place_bid(api_client, open_auction, "second", "1300.00")
+        Auction.objects.update(bid_count=0, current_price=None, leader=None)
+        call_command("rebuild_leaderboard", stdout=StringIO())
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == 2
+        assert open_auction.current_price == Decimal("1300.00")
+        assert open_auction.leader.username == "second"
+
+
+def run_concurrently(requests):
+    """Run `(user, method, url, data)` requests from parallel threads."""
+    barrier = threading.Barrier(len(requests))
+
+    def send(user, method, url, data):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            barrier.wait()
+            return getattr(client, method)(
+                url, data=json.dumps(data), content_type="application/json"
+            ).status_code
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        return list(executor.map(lambda request: send(*request), requests))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBidConcurrency:
+    def test_concurrent_duplicate_bids_create_one_bid(self, open_auction):
+        User = get_user_model()
+        bidders = [User.objects.create_user(username=f"bidder_{i}") for i in range(4)]
+        requests = [
+            (bidder, "post", "/bid/", {"auction": open_auction.id, "price": price})
+            for bidder in bidders
+            for price in ("1100.00", "1200.00", "1300.00")
+        ]
+
+        statuses = run_concurrently(requests)
+
+        assert statuses.count(status.HTTP_201_CREATED) == len(bidders)
+        assert statuses.count(status.HTTP_400_BAD_REQUEST) == 2 * len(bidders)
+        assert Bid.objects.count() == len(bidders)
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == len(bidders)
+        top_price = Bid.objects.order_by("-price").first().price
+        assert open_auction.current_price == top_price
+        # concurrent equal bids may commit out of timestamp order, so any
+        # bidder at the top price is a valid leader
+        assert Bid.objects.filter(
+            bidder=open_auction.leader_id, price=top_price
+        ).exists()
+
+    def test_concurrent_updates_keep_leaderboard_consistent(self, open_auction):
+        User = get_user_model()
+        bidders = [User.objects.create_user(username=f"bidder_{i}") for i in range(4)]
+        bids = []
+        for bidder in bidders:
+            bid = Bid.objects.create(
+                auction=open_auction, bidder=bidder, price="1000.00"
+            )
+            Auction.objects.record_bid(bid)
+            bids.append(bid)
+        requests = [
+            (
+                bid.bidder,
+                "put",
+                f"/bid/{bid.id}/",
+                {"auction": open_auction.id, "price": f"{1000 + step * 100 + i}.00"},
+            )
+            for i, bid in enumerate(bids)
+            for step in range(1, 4)
+        ]
+
+        statuses = run_concurrently(requests)
+
+        assert set(statuses) <= {status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST}
+        assert status.HTTP_200_OK in statuses
+        open_auction.refresh_from_db()
+        assert open_auction.bid_count == Bid.objects.count() == len(bidders)
+        top_price = Bid.objects.order_by("-price").first().price
+        assert open_auction.current_price == top_price
+        # concurrent equal bids may commit out of timestamp order, so any
+        # bidder at the top price is a valid leader
+        assert Bid.objects.filter(
+            bidder=open_auction.leader_id, price=top_price
+        ).exists()
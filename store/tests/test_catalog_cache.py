@@ -0,0 +1,92 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from store.cache import catalog_cache_stats
+from store.models import Category, Pet, Tags
+
+
+@pytest.fixture
+def pet():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    pet = Pet.objects.create(
+        owner=owner,
+        name="Test",
+        age=3,
+        status=True,
+        price="1200.00",
+        category=Category.objects.create(name="Test"),
+    )
+    pet.tags.add(Tags.objects.create(name="Test"))
+    return pet
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCatalogCache:
+    def test_second_request_is_served_from_cache(self, api_client, pet):
+        first = api_client.get("/store/")
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get("/store/")
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert len(queries) == 0
+
+    def test_detail_is_cached(self, api_client, pet):
+        api_client.get(f"/store/{pet.id}/")
+        response = api_client.get(f"/store/{pet.id}/")
+        assert response["X-Cache"] == "HIT"
+        assert response.data["name"] == "Test"
+
+    def test_pet_save_invalidates(self, api_client, pet):
+        api_client.get("/store/")
+        pet.name = "Renamed"
+        pet.save()
+        response = api_client.get("/store/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["name"] == "Renamed"
+
+    def test_tag_changes_invalidate(self, api_client, pet):
+        api_client.get("/store/")
+        pet.tags.add(Tags.objects.create(name="Other"))
+        response = api_client.get("/store/")
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["results"][0]["tags"]) == 2
+
+    def test_category_rename_invalidates(self, api_client, pet):
+        api_client.get(f"/store/{pet.id}/")
+        category = pet.category
+        category.name = "Renamed"
+        category.save()
+        response = api_client.get(f"/store/{pet.id}/")
+        assert response.data["category"]["name"] == "Renamed"
+
+    def test_hidden_pet_is_not_served_from_cache(self, api_client, pet):
+        api_client.get(f"/store/{pet.id}/")
+        pet.status = False
+        pet.save()
+        response = api_client.get(f"/store/{pet.id}/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_counters_track_hits_and_misses(self, api_client, pet):
+        before = catalog_cache_stats()
+        api_client.get("/store/")
+        api_client.get("/store/")
+        after = catalog_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+    def test_cache_stats_requires_admin(self, api_client, pet):
+        response = api_client.get("/store/cache-stats/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="test_password"
+        )
+        api_client.force_authenticate(user=admin)
+        response = api_client.get("/store/cache-stats/")
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {"hits", "misses"}
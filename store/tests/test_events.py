@@ -0,0 +1,183 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+
+from store.events import Event, LocalBroker, get_broker
+from store.models import Auction, Bid, Category, Pet
+from store.serializers import auction_channel
+
+
+@pytest.fixture
+def open_auction():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    pet = Pet.objects.create(
+        owner=owner,
+        name="Test",
+        age=3,
+        status=True,
+        price="1200.00",
+        category=Category.objects.create(name="Test"),
+    )
+    return Auction.objects.create(
+        pet=pet,
+        start_price="1000.00",
+        start_date=timezone.now(),
+        end_date=timezone.now() + timedelta(days=1),
+    )
+
+
+@pytest.fixture
+def watch(api_client, open_auction, settings):
+    settings.STORE_EVENTS_KEEPALIVE = 0.01
+
+    def do_watch(last_event_id=None):
+        api_client.force_authenticate(user=open_auction.pet.owner)
+        headers = {} if last_event_id is None else {"HTTP_LAST_EVENT_ID": last_event_id}
+        response = api_client.get(
+            f"/pets/{open_auction.pet_id}/bids/events/", **headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        return response, iter(response.streaming_content)
+
+    return do_watch
+
+
+def place_bid(api_client, auction, username, price):
+    bidder, _ = get_user_model().objects.get_or_create(username=username)
+    api_client.force_authenticate(user=bidder)
+    return api_client.post(
+        "/bid/",
+        data=json.dumps({"auction": auction.id, "price": price}),
+        content_type="application/json",
+    )
+
+
+def next_event(stream):
+    for chunk in stream:
+        chunk = chunk.decode()
+        if chunk.startswith("id: ") and "\ndata: " in chunk:
+            fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+            fields["data"] = json.loads(fields["data"])
+            return fields
+        assert chunk.startswith(("retry: ", ": keepalive"))
+
+
+@pytest.mark.django_db
+class TestBidEvents:
+    def test_new_and_updated_bids_are_pushed(
+        self, api_client, open_auction, watch, django_capture_on_commit_callbacks
+    ):
+        response, stream = watch()
+        assert next(stream).decode().startswith("retry: ")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = place_bid(api_client, open_auction, "bidder", "1100.00")
+        event = next_event(stream)
+        assert event["event"] == "bid"
+        assert event["data"] == json.loads(json.dumps(created.data))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(
+                f"/bid/{created.data['id']}/",
+                data=json.dumps({"price": "1300.00"}),
+                content_type="application/json",
+            )
+        event = next_event(stream)
+        assert event["data"]["id"] == created.data["id"]
+        assert event["data"]["price"] == "1300.00"
+        response.close()
+        assert get_broker().subscriber_count(auction_channel(open_auction.id)) == 0
+
+    def test_rolled_back_bid_is_not_pushed(self, api_client, open_auction, watch):
+        response, stream = watch()
+        next(stream)
+        # on_commit callbacks never run in the test transaction
+        place_bid(api_client, open_auction, "bidder", "1100.00")
+        assert next(stream) == b": keepalive\n\n"
+        response.close()
+
+    def test_last_event_id_resumes_with_missed_bids(
+        self, api_client, open_auction, watch, django_capture_on_commit_callbacks
+    ):
+        response, stream = watch()
+        with django_capture_on_commit_callbacks(execute=True):
+            place_bid(api_client, open_auction, "first", "1100.00")
+        first = next_event(stream)
+        response.close()
+
+        place_bid(api_client, open_auction, "second", "1200.00")
+        place_bid(api_client, open_auction, "third", "1300.00")
+        response, stream = watch(last_event_id=first["id"])
+        missed = [next_event(stream)["data"]["price"] for _ in range(2)]
+        assert missed == ["1200.00", "1300.00"]
+        response.close()
+
+    def test_stream_start_is_a_resume_point(self, api_client, open_auction, watch):
+        response, stream = watch()
+        start_id = next(stream).decode().split("id: ")[1].strip()
+        response.close()
+
+        place_bid(api_client, open_auction, "bidder", "1100.00")
+        response, stream = watch(last_event_id=start_id)
+        assert next_event(stream)["data"]["id"] == Bid.objects.get().id
+        response.close()
+
+    def test_only_the_owner_can_watch(self, api_client, open_auction):
+        place_bid(api_client, open_auction, "bidder", "1100.00")
+        response = api_client.get(f"/pets/{open_auction.pet_id}/bids/events/")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_pet_without_auction_returns_404(self, api_client, open_auction):
+        pet = open_auction.pet
+        open_auction.delete()
+        api_client.force_authenticate(user=pet.owner)
+        response = api_client.get(f"/pets/{pet.id}/bids/events/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def event(number):
+    return Event((number,), str(number), "bid", "{}")
+
+
+class TestLocalBroker:
+    def test_every_subscription_gets_the_event(self):
+        broker = LocalBroker()
+        first, second = broker.subscribe("a"), broker.subscribe("a")
+        other = broker.subscribe("b")
+        broker.publish("a", event(1))
+        assert first.get(0) == second.get(0) == [event(1)]
+        assert other.get(0) == []
+
+    def test_slow_subscription_overflows(self):
+        broker = LocalBroker(max_pending=2)
+        subscription = broker.subscribe("a")
+        for number in range(3):
+            broker.publish("a", event(number))
+        assert subscription.overflowed
+        assert subscription.get(0) == [event(0), event(1)]
+
+    def test_async_subscription_is_woken_from_another_thread(self):
+        broker = LocalBroker()
+
+        async def wait():
+            subscription = broker.subscribe("a")
+            loop = asyncio.get_running_loop()
+            loop.call_later(
+                0.01, lambda: loop.run_in_executor(None, broker.publish, "a", event(1))
+            )
+            return await subscription.aget(5)
+
+        assert asyncio.run(wait()) == [event(1)]
+
+    def test_closed_subscription_is_removed(self):
+        broker = LocalBroker()
+        with broker.subscribe("a"):
+            assert broker.subscriber_count("a") == 1
+        assert broker.subscriber_count("a") == 0
@@ -0,0 +1,96 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from store.models import Auction, Bid, Category, Pet, Tags
+
+
+@pytest.fixture
+def catalog(api_client):
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    bidder = User.objects.create_user(username="test_bidder", password="test_password")
+    category = Category.objects.create(name="Test")
+    tag = Tags.objects.create(name="Test")
+    for i in range(5):
+        pet = Pet.objects.create(
+            owner=owner,
+            name=f"Test {i}",
+            age=3,
+            status=True,
+            price="1200.00",
+            category=category,
+        )
+        pet.tags.add(tag)
+        auction = Auction.objects.create(
+            pet=pet,
+            start_price="1000.00",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        bid = Bid.objects.create(auction=auction, bidder=bidder, price="1100.00")
+        Auction.objects.record_bid(bid)
+    api_client.force_authenticate(user=bidder)
+
+
+def content(response):
+    assert isinstance(response, StreamingHttpResponse)
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExportEndpoints:
+    def test_export_requires_authentication(self, api_client):
+        response = api_client.get("/export/pets/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_export_pets_jsonl_matches_store(self, api_client, catalog):
+        response = api_client.get("/export/pets/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        store = api_client.get("/store/", HTTP_ACCEPT="application/json")
+        expected = json.loads(store.content)["results"]
+        assert rows == sorted(expected, key=lambda pet: pet["id"])
+
+    def test_export_pets_csv_has_store_columns(self, api_client, catalog):
+        response = api_client.get("/export/pets/?format=csv")
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.reader(StringIO(content(response))))
+        assert rows[0] == [
+            "id",
+            "name",
+            "age",
+            "status",
+            "price",
+            "category",
+            "tags",
+            "owner",
+            "isForAuction",
+        ]
+        assert len(rows) == 6
+        category = Category.objects.get()
+        assert json.loads(rows[1][5]) == {"id": category.id, "name": "Test"}
+
+    def test_export_auctions_and_bids(self, api_client, catalog):
+        auctions = content(api_client.get("/export/auctions/")).splitlines()
+        response = api_client.get("/export/bids/?format=csv")
+        bids = list(csv.reader(StringIO(content(response))))
+        assert len(auctions) == 5
+        assert json.loads(auctions[0])["bid_count"] == 1
+        assert bids[0] == ["id", "auction", "price", "created_at", "updated_at"]
+        assert len(bids) == 6
+
+    def test_export_query_count_does_not_grow_with_rows(self, api_client, catalog):
+        with CaptureQueriesContext(connection) as queries:
+            content(api_client.get("/export/pets/"))
+        assert len(queries) == 2
@@ -0,0 +1,90 @@
+import re
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework import status
+
+from store.metrics import Histogram, registry
+from store.models import Category, Pet, Tags
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+
+
+@pytest.fixture
+def pet():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    pet = Pet.objects.create(
+        owner=owner,
+        name="Test",
+        age=3,
+        status=True,
+        price="1200.00",
+        category=Category.objects.create(name="Test"),
+    )
+    pet.tags.add(Tags.objects.create(name="Test"))
+    return pet
+
+
+def sample(text, name, **labels):
+    selector = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}{{{re.escape(selector)}}} (\S+)$", text, re.M)
+    assert match, f"{name}{{{selector}}} not found"
+    return float(match.group(1))
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_server_timing_header(self, api_client, pet):
+        response = api_client.get("/store/")
+        timing = response["Server-Timing"]
+        assert re.fullmatch(
+            r'db;desc="(\d+) queries";dur=[\d.]+, serializer;dur=[\d.]+, '
+            r"total;dur=[\d.]+",
+            timing,
+        )
+        assert int(re.search(r"(\d+) queries", timing).group(1)) > 0
+
+    def test_requests_are_aggregated_by_viewset_action(self, api_client, pet):
+        api_client.get("/store/")
+        api_client.get("/store/")
+        api_client.get(f"/store/{pet.id}/")
+        api_client.get("/store/0/")
+
+        response = api_client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.content.decode()
+        labels = {"view": "StorePetViewSet.list", "method": "GET"}
+        assert sample(text, "store_request_duration_seconds_count", **labels) == 2
+        assert sample(text, "store_request_queries_count", **labels) == 2
+        assert sample(text, "store_request_queries_sum", **labels) > 0
+        assert (
+            sample(
+                text,
+                "store_requests_total",
+                view="StorePetViewSet.retrieve",
+                method="GET",
+                status=404,
+            )
+            == 1
+        )
+
+    def test_cached_response_runs_no_queries(self, api_client, pet):
+        api_client.get("/store/")
+        response = api_client.get("/store/")
+        assert response["X-Cache"] == "HIT"
+        assert response["Server-Timing"].startswith('db;desc="0 queries"')
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0, 1, 3, 7, 50):
+            histogram.observe(value)
+        assert list(histogram.cumulative()) == [(1, 2), (5, 3), (10, 4), ("+Inf", 5)]
+        assert histogram.count == 5
+        assert histogram.sum == 61
@@ -1,9 +1,15 @@
 import json
+from io import BytesIO, StringIO
+
 import pytest
 from rest_framework import status
 from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
-from store.models import Category, Tags
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from store.importers import MalformedInput, iter_records
+from store.models import Category, Pet, Tags
 
 TestPetData = {
     "name": "Test",
@@ -63,3 +69,99 @@ class TestPetEndpoints:
         assert response.data["category"] == TestPetData["category"]
         assert response.data["tags"] == TestPetData["tags"]
         assert response.data["price"] == TestPetData["price"]
+
+
+@pytest.fixture
+def importer(api_client):
+    User = get_user_model()
+    user = User.objects.create_user(username="test_user", password="test_password")
+    api_client.force_authenticate(user=user)
+    category = Category.objects.create(name="Test")
+    tag = Tags.objects.create(name="Test")
+    return user, category, tag
+
+
+def pet_rows(count, category, tag):
+    return [
+        {
+            "name": f"Test {i}",
+            "age": 3,
+            "price": "1200.00",
+            "category": category.id,
+            "tags": [tag.id],
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestPetImport:
+    def test_import_json_array(self, api_client, importer):
+        user, category, tag = importer
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                "/pets/import/",
+                data=json.dumps(pet_rows(50, category, tag)),
+                content_type="application/json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"created": 50, "failed": 0, "errors": []}
+        assert Pet.objects.filter(owner=user).count() == 50
+        assert Pet.tags.through.objects.filter(tags=tag).count() == 50
+        assert len(queries) < 10
+
+    def test_import_json_lines_reports_bad_rows(self, api_client, importer):
+        _, category, tag = importer
+        rows = pet_rows(3, category, tag)
+        rows[1]["category"] = 999
+        del rows[2]["name"]
+        body = "\n".join(json.dumps(row) for row in rows) + "\n"
+        response = api_client.post(
+            "/pets/import/", data=body, content_type="application/x-ndjson"
+        )
+        assert response.data["created"] == 1
+        assert response.data["failed"] == 2
+        assert [error["row"] for error in response.data["errors"]] == [1, 2]
+        assert "category" in response.data["errors"][0]["errors"]
+        assert "name" in response.data["errors"][1]["errors"]
+
+    def test_import_keeps_rows_before_malformed_json(self, api_client, importer):
+        _, category, tag = importer
+        body = json.dumps(pet_rows(2, category, tag))[:-1] + ', {"name": '
+        response = api_client.post(
+            "/pets/import/", data=body, content_type="application/json"
+        )
+        assert response.data["created"] == 2
+        assert response.data["failed"] == 1
+        assert response.data["errors"][0]["row"] == 2
+
+    def test_import_requires_authentication(self, api_client):
+        response = api_client.post(
+            "/pets/import/", data="[]", content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_records_are_read_across_chunk_boundaries(self):
+        rows = [{"name": "Test é", "age": i} for i in range(20)]
+        stream = BytesIO(json.dumps(rows).encode())
+        assert list(iter_records(stream, read_size=7)) == rows
+
+    def test_oversized_record_is_rejected(self):
+        stream = BytesIO(b'[{"name": "' + b"x" * 100 + b'"}]')
+        with pytest.raises(MalformedInput):
+            list(iter_records(stream, read_size=16, max_record_size=32))
+
+    def test_import_pets_command(self, importer, tmp_path):
+        user, category, tag = importer
+        path = tmp_path / "pets.jsonl"
+        path.write_text(
+            "\n".join(json.dumps(row) for row in pet_rows(5, category, tag))
+        )
+        call_command(
+            "import_pets",
+            str(path),
+            owner=user.username,
+            batch_size=2,
+            stdout=StringIO(),
+        )
+        assert Pet.objects.filter(owner=user).count() == 5
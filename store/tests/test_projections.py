@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from store.models import Auction, Bid, Category, Pet, Tags
+
+
+@pytest.fixture
+def owner():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    bidders = [
+        User.objects.create_user(username=f"test_bidder_{i}", password="test_password")
+        for i in range(3)
+    ]
+    categories = [Category.objects.create(name=f"Category {i}") for i in range(2)]
+    tags = [Tags.objects.create(name=f"Tag {i}") for i in range(3)]
+    for i in range(6):
+        pet = Pet.objects.create(
+            owner=owner,
+            name=f"Test {i}",
+            age=i,
+            status=i != 5,
+            price=f"{1000 + i}.50",
+            category=categories[i % 2],
+        )
+        pet.tags.add(*reversed(tags[: i % 4]))
+        if i % 2:
+            continue
+        auction = Auction.objects.create(
+            pet=pet,
+            start_price="1000.00",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        for bidder in bidders[: i // 2 + 1]:
+            bid = Bid.objects.create(
+                auction=auction, bidder=bidder, price=f"{1100 + bidder.id}.25"
+            )
+            Auction.objects.record_bid(bid)
+    return owner
+
+
+def get_both(api_client, settings, url):
+    responses = []
+    for fast in (False, True):
+        settings.STORE_FAST_READS = fast
+        cache.clear()
+        responses.append(api_client.get(url, HTTP_ACCEPT="application/json"))
+    return responses
+
+
+@pytest.mark.django_db
+class TestProjections:
+    def test_store_list_matches_serializer(self, api_client, settings, owner):
+        slow, fast = get_both(api_client, settings, "/store/?page_size=3")
+        assert len(slow.data["results"]) == 3
+        assert fast.content == slow.content
+
+    def test_store_next_page_matches_serializer(self, api_client, settings, owner):
+        first = api_client.get("/store/?page_size=3").data["next"]
+        slow, fast = get_both(api_client, settings, first)
+        assert len(slow.data["results"]) == 2
+        assert fast.content == slow.content
+
+    def test_pet_list_matches_serializer(self, api_client, settings, owner):
+        api_client.force_authenticate(user=owner)
+        slow, fast = get_both(api_client, settings, "/pets/")
+        assert len(slow.data["results"]) == 6
+        assert fast.content == slow.content
@@ -0,0 +1,101 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from store.models import Auction, Bid, Category, Pet, Tags
+
+# SQLite reports a full table scan as "SCAN <table>" with no index.
+FULL_SCAN = re.compile(r"\bSCAN (store_\w+|core_\w+)$")
+
+
+@pytest.fixture
+def catalog():
+    User = get_user_model()
+    owner = User.objects.create_user(username="test_owner", password="test_password")
+    bidder = User.objects.create_user(username="test_bidder", password="test_password")
+    category = Category.objects.create(name="Test")
+    tag = Tags.objects.create(name="Test")
+    pets = []
+    for i in range(3):
+        pet = Pet.objects.create(
+            owner=owner,
+            name=f"Test {i}",
+            age=3,
+            status=True,
+            price="1200.00",
+            category=category,
+        )
+        pet.tags.add(tag)
+        auction = Auction.objects.create(
+            pet=pet,
+            start_price="1000.00",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        bid = Bid.objects.create(auction=auction, bidder=bidder, price="1100.00")
+        Auction.objects.record_bid(bid)
+        pets.append(pet)
+    return owner, bidder, pets
+
+
+def full_scans(queries):
+    scans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            for row in cursor.fetchall():
+                if FULL_SCAN.search(row[-1]):
+                    scans.append((row[-1], query["sql"]))
+    return scans
+
+
+def assert_uses_indexes(api_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert full_scans(queries) == []
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+    @pytest.fixture(autouse=True)
+    def sqlite_only(self):
+        if connection.vendor != "sqlite":
+            pytest.skip("query plan assertions are written for SQLite")
+
+    def test_store_list_uses_indexes(self, api_client, catalog):
+        assert_uses_indexes(api_client, "/store/")
+        next_page = api_client.get("/store/?page_size=1").data["next"]
+        assert_uses_indexes(api_client, next_page)
+
+    def test_store_detail_uses_indexes(self, api_client, catalog):
+        _, _, pets = catalog
+        assert_uses_indexes(api_client, f"/store/{pets[0].id}/")
+
+    def test_owner_endpoints_use_indexes(self, api_client, catalog):
+        owner, _, pets = catalog
+        api_client.force_authenticate(user=owner)
+        assert_uses_indexes(api_client, "/pets/")
+        assert_uses_indexes(api_client, f"/pets/{pets[0].id}/")
+        assert_uses_indexes(api_client, "/auction/")
+        assert_uses_indexes(api_client, f"/pets/{pets[0].id}/bids/")
+
+    def test_bidder_endpoints_use_indexes(self, api_client, catalog):
+        _, bidder, _ = catalog
+        api_client.force_authenticate(user=bidder)
+        assert_uses_indexes(api_client, "/bid/")
+
+    def test_top_bid_lookup_uses_price_index(self, catalog):
+        _, _, pets = catalog
+        top_bid = Bid.objects.filter(auction__pet=pets[0]).order_by(
+            "-price", "updated_at", "id"
+        )
+        assert "store_bid_auction_price_idx" in top_bid[:1].explain()
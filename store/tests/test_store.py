@@ -1,5 +1,61 @@
+from datetime import timedelta
+from decimal import Decimal
+
 import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from store.models import Auction, Bid, Category, Pet, Tags
+from store.pagination import KeysetPagination
+
+
+def create_pets(count, bids_per_auction=2):
+    User = get_user_model()
+    owner = User.objects.create_user(
+        username=f"owner_{Pet.objects.count()}", password="test_password"
+    )
+    bidders = [
+        User.objects.create_user(
+            username=f"bidder_{Pet.objects.count()}_{i}", password="test_password"
+        )
+        for i in range(bids_per_auction)
+    ]
+    category = Category.objects.create(name="Test")
+    tag = Tags.objects.create(name="Test")
+    for i in range(count):
+        pet = Pet.objects.create(
+            owner=owner,
+            name=f"Test {i}",
+            age=3,
+            status=True,
+            price="1200.00",
+            category=category,
+        )
+        pet.tags.add(tag)
+        auction = Auction.objects.create(
+            pet=pet,
+            start_price="1000.00",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        for bidder in bidders:
+            bid = Bid.objects.create(auction=auction, bidder=bidder, price="1100.00")
+            Auction.objects.record_bid(bid)
+
+
+def count_store_queries(api_client):
+    # measure the database path, not a cached response
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/store/")
+    assert response.status_code == status.HTTP_200_OK
+    return len(queries)
 
 
 @pytest.mark.django_db
@@ -7,3 +63,69 @@ class TestStoreEndpoints:
     def test_user_is_anonymous_returns_200(self, api_client):
         response = api_client.get("/store/")
         assert response.status_code == status.HTTP_200_OK
+
+    def test_store_returns_number_of_bids(self, api_client):
+        create_pets(1, bids_per_auction=3)
+        response = api_client.get("/store/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["isForAuction"]["number_of_bids"] == 3
+        assert response.data["results"][0]["isForAuction"]["current_price"] == Decimal(
+            "1100.00"
+        )
+
+    def test_store_query_count_does_not_grow_with_rows(self, api_client):
+        create_pets(1)
+        one_pet = count_store_queries(api_client)
+        create_pets(10)
+        many_pets = count_store_queries(api_client)
+        assert one_pet == many_pets
+
+    def test_store_pet_without_auction_is_not_for_auction(self, api_client):
+        create_pets(1)
+        Auction.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/store/")
+        assert response.data["results"][0]["isForAuction"] is False
+        assert len(queries) == 2
+
+    def test_store_is_paginated_without_offset_or_count(self, api_client):
+        create_pets(5, bids_per_auction=0)
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/store/?page_size=2")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["previous"] is None
+        assert response.data["next"] is not None
+        for query in queries:
+            assert "OFFSET" not in query["sql"].upper()
+            assert "COUNT(*)" not in query["sql"].upper()
+
+    def test_store_cursor_walks_every_pet_once(self, api_client):
+        create_pets(7, bids_per_auction=0)
+        seen = []
+        url = "/store/?page_size=3"
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(pet["id"] for pet in response.data["results"])
+            url = response.data["next"]
+        assert seen == list(
+            Pet.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_store_previous_link_returns_previous_page(self, api_client):
+        create_pets(5, bids_per_auction=0)
+        first = api_client.get("/store/?page_size=2")
+        second = api_client.get(first.data["next"])
+        previous = api_client.get(second.data["previous"])
+        assert previous.data["results"] == first.data["results"]
+        assert previous.data["previous"] is None
+
+    def test_store_page_size_is_capped(self):
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get("/store/?page_size=100000"))
+        assert paginator.get_page_size(request) == paginator.max_page_size
+
+    def test_store_invalid_cursor_returns_404(self, api_client):
+        response = api_client.get("/store/?cursor=not-a-cursor")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework import routers
 from rest_framework_nested import routers
+from . import async_views
 from .views import (
     AuctionViewSet,
     BidViewSet,
+    ExportViewSet,
     PetBidViewSet,
     PetViewSet,
     StorePetViewSet,
@@ -14,8 +17,16 @@ router.register("pets", PetViewSet, basename="Pets")
 router.register("store", StorePetViewSet, basename="Store")
 router.register("auction", AuctionViewSet, basename="Auction")
 router.register("bid", BidViewSet, basename="Bid")
+router.register("export", ExportViewSet, basename="Export")
 
 router_pet = routers.NestedDefaultRouter(router, "pets", lookup="pet")
 router_pet.register("bids", PetBidViewSet, basename="pet-bids")
 
-urlpatterns = router.urls + router_pet.urls
+# Async versions of the busiest routes, for ASGI deployments.
+async_urlpatterns = [
+    path("async/store/", async_views.store_list, name="async-store-list"),
+    path("async/store/<int:pk>/", async_views.store_detail, name="async-store-detail"),
+    path("async/bid/", async_views.place_bid, name="async-bid-create"),
+]
+
+urlpatterns = router.urls + router_pet.urls + async_urlpatterns
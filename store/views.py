@@ -1,19 +1,39 @@
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
-
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from .cache import CatalogCacheMixin, catalog_cache_stats
+from .events import EventStreamRenderer, astream_events, stream_events
+from .exports import CSVRenderer, JSONLinesRenderer, iter_csv, iter_jsonl, iter_rows
+from .importers import import_pets, iter_records
 from .permissions import IsOwnerOfThePet, OwnerOnly
-from .models import Bid, Pet, Auction
+from .models import Bid, Pet, Auction, Tags
+from .projections import PetProjection, ProjectedListMixin, StorePetProjection
 from .serializers import (
     AuctionSerializer,
     CreatePetSerializer,
     PetSerializer,
     StorePetSerializer,
     BidSerializer,
+    auction_channel,
+    bid_event,
+    bid_event_key,
+    bids_after,
+    format_bid_event_id,
+    parse_bid_event_id,
 )
 
 
-class PetViewSet(viewsets.ModelViewSet):
+class PetViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     serializer_class = PetSerializer
+    projection_class = PetProjection
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -31,24 +51,55 @@ class PetViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), OwnerOnly()]
         return [IsAuthenticated()]
 
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request):
+        """
+        Create many pets from a JSON array or JSON Lines body. The body is
+        streamed and imported in batches; invalid rows are reported and skipped.
+        """
+        if request.stream is None:
+            return Response(
+                {"detail": "The request body is empty."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        result = import_pets(iter_records(request.stream), owner=request.user)
+        return Response(result)
+
     def get_queryset(self):
         return (
             Pet.objects.filter(owner=self.request.user)
             .select_related("owner")
             .select_related("category")
-            .prefetch_related("tags")
+            .select_related("auction")
+            .prefetch_related(Prefetch("tags", queryset=Tags.objects.order_by("id")))
+            .prefetch_related(
+                Prefetch(
+                    "auction__bid_set",
+                    queryset=Bid.objects.select_related("bidder").order_by(
+                        "created_at", "id"
+                    ),
+                )
+            )
         )
 
 
-class StorePetViewSet(viewsets.ReadOnlyModelViewSet):
+class StorePetViewSet(
+    CatalogCacheMixin, ProjectedListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = StorePetSerializer
+    projection_class = StorePetProjection
     queryset = (
         Pet.objects.filter(status=True)
         .select_related("owner")
         .select_related("category")
-        .prefetch_related("tags")
+        .select_related("auction")
+        .prefetch_related(Prefetch("tags", queryset=Tags.objects.order_by("id")))
     )
 
+    @action(detail=False, url_path="cache-stats", permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        return Response(catalog_cache_stats())
+
 
 class AuctionViewSet(viewsets.ModelViewSet):
     serializer_class = AuctionSerializer
@@ -66,6 +117,11 @@ class BidViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Bid.objects.filter(bidder=self.request.user)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            Auction.objects.record_bid_removal(instance)
+
 
 class PetBidViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Bid.objects.all()
@@ -85,3 +141,88 @@ class PetBidViewSet(viewsets.ReadOnlyModelViewSet):
         if self.request.user.is_anonymous:
             return [IsAuthenticated()]
         return [IsOwnerOfThePet(), IsAuthenticated()]
+
+    @action(detail=False, renderer_classes=[EventStreamRenderer])
+    def events(self, request, pet_pk=None):
+        """
+        Server-Sent Events stream of the bids created or updated on the
+        pet's auction. A client reconnecting with Last-Event-ID first gets
+        the bids it missed.
+        """
+        auction = get_object_or_404(Auction, pet=pet_pk)
+        bids = Bid.objects.filter(auction=auction)
+        last_key = parse_bid_event_id(request.headers.get("Last-Event-ID"))
+        # Resume from the stream's start if no event arrives before a
+        # reconnect.
+        start_id = format_bid_event_id(bid_event_key(timezone.now(), 0))
+
+        if isinstance(request._request, ASGIRequest):
+
+            async def backlog(key):
+                return [bid_event(bid) async for bid in bids_after(bids, key)]
+
+            content = astream_events(
+                auction_channel(auction.id), backlog, last_key, start_id
+            )
+        else:
+
+            def backlog(key):
+                return [bid_event(bid) for bid in bids_after(bids, key).iterator()]
+
+            content = stream_events(
+                auction_channel(auction.id), backlog, last_key, start_id
+            )
+        response = StreamingHttpResponse(content, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Tell nginx not to buffer the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """
+    Stream the whole public catalog as JSON Lines (default) or CSV
+    (`?format=csv`), in constant memory.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONLinesRenderer, CSVRenderer]
+
+    @action(detail=False)
+    def pets(self, request):
+        return self.export(
+            "pets",
+            StorePetViewSet.queryset.order_by("pk"),
+            StorePetSerializer(context={"request": request}),
+        )
+
+    @action(detail=False)
+    def auctions(self, request):
+        return self.export(
+            "auctions",
+            Auction.objects.filter(pet__status=True).order_by("pk"),
+            AuctionSerializer(context={"request": request}),
+        )
+
+    @action(detail=False)
+    def bids(self, request):
+        return self.export(
+            "bids",
+            Bid.objects.filter(auction__pet__status=True).order_by("pk"),
+            BidSerializer(context={"request": request}),
+        )
+
+    def export(self, name, queryset, serializer):
+        rows = iter_rows(queryset, serializer)
+        renderer = self.request.accepted_renderer
+        if renderer.format == "csv":
+            content = iter_csv(rows, list(serializer.fields))
+        else:
+            content = iter_jsonl(rows)
+        response = StreamingHttpResponse(
+            content, content_type=f"{renderer.media_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{name}.{renderer.format}"'
+        )
+        return response